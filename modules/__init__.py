@@ -4,9 +4,12 @@ Valac Security Scanner Suite Modules
 
 This package contains all modules for the Valac security scanner:
 - scanner: IP vulnerability scanning
+- scanner_async: asyncio/aiohttp variant of the scanner
 - dns_resolver: DNS to IP resolution
+- dns_cache: Shared TTL cache for DNS lookups
 - subdomain_enum: Subdomain enumeration
 - fuzzer: Directory and VHost fuzzing
+- wordlist: Shared wordlist loader
 - csv_extractor: CSV domain extraction
 - bypass_system: Rate limit bypass system
 - visualizer: Interactive dashboard generation
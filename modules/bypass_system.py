@@ -12,6 +12,12 @@ import threading
 from collections import deque
 from typing import Optional, Dict, Any, List
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Color codes
 RED = "\033[91m"
 YELLOW = "\033[93m"
@@ -128,17 +134,26 @@ class CacheManager:
         """Load cache from file"""
         if os.path.exists(self.cache_file):
             try:
-                with open(self.cache_file, 'r') as f:
-                    self.cache = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError, IOError):
+                # Feed raw bytes to the parser; json.loads accepts bytes too
+                with open(self.cache_file, 'rb') as f:
+                    data = f.read()
+                self.cache = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+            except (FileNotFoundError, ValueError, IOError):  # JSONDecodeError subclasses ValueError
                 self.cache = {}
     
     def save_cache(self):
         """Save cache to file"""
         with self.lock:
+            # Write to a temp file and swap it in so a crash never leaves a truncated cache
+            tmp_file = f"{self.cache_file}.tmp"
             try:
-                with open(self.cache_file, 'w') as f:
-                    json.dump(self.cache, f, indent=2)
+                if ORJSON_AVAILABLE:
+                    data = orjson.dumps(self.cache)
+                else:
+                    data = json.dumps(self.cache, separators=(',', ':')).encode('utf-8')
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, self.cache_file)
             except (IOError, OSError, PermissionError):
                 # Silently ignore cache save errors
                 pass
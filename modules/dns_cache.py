@@ -0,0 +1,36 @@
+"""
+DNS Cache Module - Process-wide cache for getaddrinfo lookups
+Shared by the scanner, resolver and security checks so a name is only
+resolved once per TTL window
+"""
+
+import socket
+import time
+from functools import lru_cache
+from typing import List
+
+DNS_CACHE_TTL = 900  # Seconds a successful lookup is reused
+DNS_CACHE_SIZE = 65536  # Maximum cached (name, TTL window) entries
+
+
+@lru_cache(maxsize=DNS_CACHE_SIZE)
+def _cached_getaddrinfo(name: str, ttl_bucket: int) -> tuple:
+    # ttl_bucket only changes every TTL seconds, which expires older entries
+    return tuple(socket.getaddrinfo(name, None))
+
+
+def resolve(name: str, ttl: int = DNS_CACHE_TTL) -> tuple:
+    """Return socket.getaddrinfo(name, None), cached for up to ttl seconds"""
+    return _cached_getaddrinfo(name, int(time.time() // ttl))
+
+
+def resolve_ips(name: str, include_ipv6: bool = False) -> List[str]:
+    """Return the unique addresses for name, IPv4 first, in resolver order"""
+    ipv4 = []
+    ipv6 = []
+    for family, _, _, _, sockaddr in resolve(name):
+        if family == socket.AF_INET and sockaddr[0] not in ipv4:
+            ipv4.append(sockaddr[0])
+        elif include_ipv6 and family == socket.AF_INET6 and sockaddr[0] not in ipv6:
+            ipv6.append(sockaddr[0])
+    return ipv4 + ipv6
@@ -7,6 +7,7 @@ import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Iterable, List, Set
 from tqdm import tqdm
+from .dns_cache import resolve
 
 # Color codes
 GREEN = "\033[92m"
@@ -23,7 +24,7 @@ class DNSResolverModule:
         try:
             # Set socket timeout
             socket.setdefaulttimeout(timeout)
-            for family, _, _, _, sockaddr in socket.getaddrinfo(domain, None):
+            for family, _, _, _, sockaddr in resolve(domain):
                 if family == socket.AF_INET:
                     ip = sockaddr[0]
                     addresses.add(ip)
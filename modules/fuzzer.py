@@ -12,6 +12,7 @@ from urllib.parse import urljoin
 from typing import Set, List, Optional
 from tqdm.asyncio import tqdm as atqdm
 from collections import deque
+from .wordlist import load_wordlist
 
 try:
     import psutil
@@ -203,26 +204,22 @@ async def worker_vhost(queue: asyncio.Queue, session: aiohttp.ClientSession, bas
 
 
 async def run_dir_async(args):
-    import os
-    if not os.path.exists(args.w):
-        print(f"{RED}[ERROR]{RESET} Wordlist file not found: {args.w}")
-        return
+    # valac.py preloads the wordlist; fall back to reading it here
+    words = getattr(args, "wordlist_data", None)
+    if words is None:
+        if not os.path.exists(args.w):
+            print(f"{RED}[ERROR]{RESET} Wordlist file not found: {args.w}")
+            return
+        try:
+            words = load_wordlist(args.w)
+        except Exception as e:
+            print(f"{RED}[ERROR]{RESET} Error reading wordlist: {e}")
+            return
     
     # Initialize resource monitor
     monitor = ResourceMonitor()
     
-    # Count total words first
-    total_words = 0
-    try:
-        with open(args.w, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                w = line.strip()
-                if w and not w.startswith("#"):
-                    total_words += 1
-    except Exception as e:
-        print(f"{RED}[ERROR]{RESET} Error reading wordlist: {e}")
-        return
-    
+    total_words = len(words)
     if total_words == 0:
         print(f"{YELLOW}[WARN]{RESET} Wordlist is empty")
         return
@@ -256,17 +253,11 @@ async def run_dir_async(args):
         # Producer task to load words into queue
         async def producer():
             try:
-                with open(args.w, "r", encoding="utf-8", errors="ignore") as f:
-                    for line in f:
-                        w = line.strip()
-                        if not w or w.startswith("#"):
-                            continue
-                        # Wait if queue is full
-                        while q.qsize() >= MAX_QUEUE_SIZE:
-                            await asyncio.sleep(0.1)
-                        await q.put(w)
-            except Exception as e:
-                print(f"{RED}[ERROR]{RESET} Error reading wordlist: {e}")
+                for w in words:
+                    # Wait if queue is full
+                    while q.qsize() >= MAX_QUEUE_SIZE:
+                        await asyncio.sleep(0.1)
+                    await q.put(w)
             finally:
                 # Signal workers to stop
                 for _ in range(args.t):
@@ -303,26 +294,22 @@ async def run_dir_async(args):
 
 
 async def run_vhost_async(args):
-    import os
-    if not os.path.exists(args.w):
-        print(f"{RED}[ERROR]{RESET} Wordlist file not found: {args.w}")
-        return
+    # valac.py preloads the wordlist; fall back to reading it here
+    words = getattr(args, "wordlist_data", None)
+    if words is None:
+        if not os.path.exists(args.w):
+            print(f"{RED}[ERROR]{RESET} Wordlist file not found: {args.w}")
+            return
+        try:
+            words = load_wordlist(args.w)
+        except Exception as e:
+            print(f"{RED}[ERROR]{RESET} Error reading wordlist: {e}")
+            return
     
     # Initialize resource monitor
     monitor = ResourceMonitor()
     
-    # Count total words first
-    total_words = 0
-    try:
-        with open(args.w, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                w = line.strip()
-                if w and not w.startswith("#"):
-                    total_words += 1
-    except Exception as e:
-        print(f"{RED}[ERROR]{RESET} Error reading wordlist: {e}")
-        return
-    
+    total_words = len(words)
     if total_words == 0:
         print(f"{YELLOW}[WARN]{RESET} Wordlist is empty")
         return
@@ -356,16 +343,10 @@ async def run_vhost_async(args):
         # Producer task
         async def producer():
             try:
-                with open(args.w, "r", encoding="utf-8", errors="ignore") as f:
-                    for line in f:
-                        w = line.strip()
-                        if not w or w.startswith("#"):
-                            continue
-                        while q.qsize() >= MAX_QUEUE_SIZE:
-                            await asyncio.sleep(0.1)
-                        await q.put(w)
-            except Exception as e:
-                print(f"{RED}[ERROR]{RESET} Error reading wordlist: {e}")
+                for w in words:
+                    while q.qsize() >= MAX_QUEUE_SIZE:
+                        await asyncio.sleep(0.1)
+                    await q.put(w)
             finally:
                 for _ in range(args.t):
                     await q.put(None)
@@ -22,6 +22,7 @@ from typing import List, Dict, Optional, Any
 from tqdm import tqdm
 from collections import deque
 from .bypass_system import BypassSystem
+from .dns_cache import resolve_ips
 from .visualizer import DashboardGenerator
 
 try:
@@ -110,23 +111,34 @@ class Database:
         conn.close()
 
 
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
+]
+
+
+def build_session(pool_size: int = 50) -> requests.Session:
+    """Create a keep-alive requests.Session with retries and a pool sized for pool_size workers"""
+    session = requests.Session()
+    session.headers.update({'User-Agent': random.choice(USER_AGENTS)})
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=pool_size, pool_maxsize=pool_size * 2)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class ScannerModule:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.max_workers = 10
         self.timeout = 5
         self.delay = 0.1
         self.cache = {}
-        self.session = requests.Session()
-        self.user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        ]
-        self.session.headers.update({'User-Agent': random.choice(self.user_agents)})
-        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries, pool_connections=50, pool_maxsize=50)
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # A shared session can be injected so connections are reused across callers;
+        # otherwise one is built on first use (the async scanner may never need it)
+        self._session = session
+        self.user_agents = USER_AGENTS
         self.database = None
         self.enable_database = False
         self.enable_geolocation = False
@@ -139,6 +151,7 @@ class ScannerModule:
         self.scan_results = []  # Store results for XML/HTML output
         self.results_lock = threading.Lock()
         self.blacklist_protection = None  # Blacklist protection instance
+        self.inline_assets = False  # Embed dashboard JS/CSS instead of CDN links
         self.stats = {
             'scanned': 0,
             'errors': 0,
@@ -150,6 +163,28 @@ class ScannerModule:
             'last_memory_check': 0
         }
 
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = build_session()
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session):
+        self._session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Persist the bypass cache even when the scan is interrupted or fails"""
+        if self.use_bypass and self.bypass_system:
+            self.bypass_system.save_cache()
+            bypass_stats = self.bypass_system.get_stats()
+            if bypass_stats['cached'] > 0:
+                print(f"{CYAN}[INFO]{RESET} Bypass stats: {bypass_stats['success']} success, {bypass_stats['cached']} cached, {bypass_stats['rate_limited']} rate limited")
+        return False
+
     def get_severity_color(self, cvss_score):
         if cvss_score is None:
             cvss_score = 0
@@ -194,7 +229,8 @@ class ScannerModule:
         else:
             return "LOW"
 
-    def fetch_cve_details(self, cve_id):
+    def cached_cve_details(self, cve_id) -> Optional[Dict]:
+        """Return cached CVE details, or None if missing or expired"""
         if cve_id in self.cache:
             entry = self.cache[cve_id]
             # Check if cache entry is expired (older than 24 hours)
@@ -204,6 +240,12 @@ class ScannerModule:
                     return {k: v for k, v in entry.items() if k != '_ts'}
             else:
                 return {k: v for k, v in entry.items() if k != '_ts'}
+        return None
+
+    def fetch_cve_details(self, cve_id):
+        cached = self.cached_cve_details(cve_id)
+        if cached is not None:
+            return cached
 
         try:
             url = f"https://cvedb.shodan.io/cve/{cve_id}"
@@ -468,14 +510,76 @@ class ScannerModule:
                 results_dict.append(result_dict)
             
             # Generate dashboard
-            generator = DashboardGenerator()
-            generator.generate(results_dict, filename)
-            print(f"{GREEN}[INFO]{RESET} Interactive dashboard saved to {filename}")
+            generator = DashboardGenerator(inline_assets=self.inline_assets)
+            if generator.generate(results_dict, filename):
+                print(f"{GREEN}[INFO]{RESET} Interactive dashboard saved to {filename}")
         except Exception as e:
             print(f"{RED}[ERROR]{RESET} Failed to save dashboard: {e}")
             import traceback
             traceback.print_exc()
 
+    def record_result(self, ip, data, response_time, geolocation, options, jsonl_file=None, csv_file=None) -> ScanResult:
+        """Score an InternetDB response, print and save it, and update stats (CVE details must be cached)"""
+        ports = data.get("ports", [])
+        vulns = data.get("vulns", [])
+        hostnames = data.get("hostnames", [])
+        cpe = data.get("cpe", [])
+        tags = data.get("tags", [])
+
+        severity_score = self.calculate_severity_score(vulns, self.cache)
+        risk_level = self.get_risk_level(severity_score)
+        
+        # If severity score is 0 but we have vulns, assign a default score based on count
+        if severity_score == 0.0 and vulns:
+            # Assign default score: 1 vuln = 3.0 (MEDIUM), 5+ vulns = 7.0 (HIGH), 10+ = 9.0 (CRITICAL)
+            if len(vulns) >= 10:
+                severity_score = 9.0
+            elif len(vulns) >= 5:
+                severity_score = 7.0
+            elif len(vulns) >= 1:
+                severity_score = 4.0
+            risk_level = self.get_risk_level(severity_score)
+        technologies = self.detect_technologies(ports)
+
+        result = ScanResult(
+            ip=ip,
+            ports=ports,
+            vulns=vulns,
+            hostnames=hostnames,
+            cpe=cpe,
+            tags=tags,
+            timestamp=datetime.datetime.now().isoformat(),
+            response_time=response_time,
+            geolocation=geolocation,
+            technologies=technologies,
+            severity_score=severity_score,
+            risk_level=risk_level
+        )
+
+        results = self.format_output(ip, data, options)
+        for r in results:
+            # Use tqdm.write() to ensure output is visible even with progress bar
+            tqdm.write(r)
+
+        self.save_results(result, jsonl_file, csv_file)
+        
+        # Store result for XML/HTML output
+        with self.results_lock:
+            self.scan_results.append(result)
+
+        self.stats['scanned'] += 1
+        self.stats['vulns_found'] += len(vulns)
+        if severity_score >= 7.0:
+            self.stats['critical_ips'].append(ip)
+        
+        # Periodic memory check (every 100 scans)
+        if self.stats['scanned'] % 100 == 0:
+            memory = self.check_memory()
+            if memory and memory > 2048:  # Warn if > 2GB
+                tqdm.write(f"{YELLOW}[WARN]{RESET} High memory usage: {memory:.1f}MB")
+
+        return result
+
     def process_ip(self, ip, options, jsonl_file=None, csv_file=None):
         """Process single IP with timeout and exception protection"""
         start_time = time.time()
@@ -516,75 +620,19 @@ class ScannerModule:
                 
                 data = response.json()
 
-            ports = data.get("ports", [])
-            vulns = data.get("vulns", [])
-            hostnames = data.get("hostnames", [])
-            cpe = data.get("cpe", [])
-            tags = data.get("tags", [])
-
             # Fetch CVE details to populate cache before calculating severity score
             # This ensures CVSS scores are available for severity calculation
-            for vuln in vulns:
+            for vuln in data.get("vulns", []):
                 cve_info = self.fetch_cve_details(vuln)
                 # If CVE details not in cache yet, try to get basic info
                 if not cve_info and vuln not in self.cache:
                     # Store placeholder to avoid repeated API calls
                     self.cache[vuln] = {'_ts': time.time()}
 
-            severity_score = self.calculate_severity_score(vulns, self.cache)
-            risk_level = self.get_risk_level(severity_score)
-            
-            # If severity score is 0 but we have vulns, assign a default score based on count
-            if severity_score == 0.0 and vulns:
-                # Assign default score: 1 vuln = 3.0 (MEDIUM), 5+ vulns = 7.0 (HIGH), 10+ = 9.0 (CRITICAL)
-                if len(vulns) >= 10:
-                    severity_score = 9.0
-                elif len(vulns) >= 5:
-                    severity_score = 7.0
-                elif len(vulns) >= 1:
-                    severity_score = 4.0
-                risk_level = self.get_risk_level(severity_score)
             geolocation = self.fetch_geolocation(ip) if self.enable_geolocation else {}
-            technologies = self.detect_technologies(ports)
-
-            result = ScanResult(
-                ip=ip,
-                ports=ports,
-                vulns=vulns,
-                hostnames=hostnames,
-                cpe=cpe,
-                tags=tags,
-                timestamp=datetime.datetime.now().isoformat(),
-                response_time=response_time,
-                geolocation=geolocation,
-                technologies=technologies,
-                severity_score=severity_score,
-                risk_level=risk_level
-            )
+            result = self.record_result(ip, data, response_time, geolocation, options, jsonl_file, csv_file)
 
-            results = self.format_output(ip, data, options)
-            for r in results:
-                # Use tqdm.write() to ensure output is visible even with progress bar
-                tqdm.write(r)
-
-            self.save_results(result, jsonl_file, csv_file)
-            
-            # Store result for XML/HTML output
-            with self.results_lock:
-                self.scan_results.append(result)
-
-            self.stats['scanned'] += 1
-            self.stats['vulns_found'] += len(vulns)
-            if severity_score >= 7.0:
-                self.stats['critical_ips'].append(ip)
-            
-            # Periodic memory check (every 100 scans)
-            if self.stats['scanned'] % 100 == 0:
-                memory = self.check_memory()
-                if memory and memory > 2048:  # Warn if > 2GB
-                    tqdm.write(f"{YELLOW}[WARN]{RESET} High memory usage: {memory:.1f}MB")
-
-            if risk_level in ["CRITICAL", "HIGH"]:
+            if result.risk_level in ["CRITICAL", "HIGH"]:
                 self.send_webhook_notification(result)
 
             if self.delay and not self.use_bypass:
@@ -649,6 +697,22 @@ class ScannerModule:
             colour='green'
         )
         
+        try:
+            self.scan_targets(valid_ips, pbar, options, jsonl_file, csv_file)
+        finally:
+            pbar.close()
+
+    def update_progress(self, pbar):
+        """Advance the progress bar and refresh the running stats"""
+        pbar.update(1)
+        pbar.set_postfix({
+            'Scanned': self.stats['scanned'],
+            'Errors': self.stats['errors'],
+            'Vulns': self.stats['vulns_found']
+        })
+
+    def scan_targets(self, valid_ips, pbar, options, jsonl_file=None, csv_file=None):
+        """Scan all IPs on a thread pool"""
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {executor.submit(self.process_ip, ip, options, jsonl_file, csv_file): ip 
                       for ip in valid_ips}
@@ -656,20 +720,13 @@ class ScannerModule:
             for future in as_completed(futures):
                 try:
                     future.result()
-                    pbar.update(1)
                     # Update description with current stats
-                    pbar.set_postfix({
-                        'Scanned': self.stats['scanned'],
-                        'Errors': self.stats['errors'],
-                        'Vulns': self.stats['vulns_found']
-                    })
+                    self.update_progress(pbar)
                 except Exception as e:
                     ip = futures[future]
                     self.stats['errors'] += 1
                     pbar.write(f"{RED}[ERROR]{RESET} Failed processing {ip}: {str(e)}")
                     pbar.update(1)
-        
-        pbar.close()
 
     def validate_ip(self, ip):
         try:
@@ -704,8 +761,7 @@ class ScannerModule:
 
     def resolve_domain_to_ips(self, domain: str) -> List[str]:
         try:
-            ips = socket.gethostbyname_ex(domain)[2]
-            return ips
+            return resolve_ips(domain)
         except (socket.gaierror, socket.herror, OSError):
             return []
 
@@ -763,6 +819,7 @@ class ScannerModule:
         self.requests_per_second = args.rps
         self.enable_geolocation = args.geolocation
         self.webhook_url = args.webhook
+        self.inline_assets = getattr(args, 'inline_assets', False)
 
         if args.database:
             self.enable_database = True
@@ -798,8 +855,9 @@ class ScannerModule:
         targets = []
 
         if args.ip:
-            if self.validate_ip(args.ip):
-                targets.append(args.ip)
+            # valac.py passes an already parsed ipaddress object
+            if not isinstance(args.ip, str) or self.validate_ip(args.ip):
+                targets.append(str(args.ip))
             else:
                 print(f"{RED}[ERROR]{RESET} Invalid IP format: {args.ip}")
                 return
@@ -815,7 +873,7 @@ class ScannerModule:
 
         if args.cidr:
             try:
-                network = ipaddress.ip_network(args.cidr, strict=False)
+                network = args.cidr if isinstance(args.cidr, (ipaddress.IPv4Network, ipaddress.IPv6Network)) else ipaddress.ip_network(args.cidr, strict=False)
                 cidr_ips = [str(ip) for ip in network.hosts()]
                 print(f"{YELLOW}[INFO]{RESET} CIDR {args.cidr} expanded to {len(cidr_ips)} hosts")
                 targets.extend(cidr_ips)
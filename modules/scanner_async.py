@@ -0,0 +1,190 @@
+"""
+Async Scanner Module - IP Vulnerability Scanner on asyncio/aiohttp
+Same workflow and output as the threaded scanner, with every HTTP call
+multiplexed on a single event loop
+"""
+
+import asyncio
+import aiohttp
+import random
+import time
+from typing import Any, Dict, Optional
+from tqdm import tqdm
+
+from .scanner import ScannerModule, ScanResult
+
+# Color codes
+RED = "\033[91m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+# Retry policy (mirrors the threaded scanner's urllib3 Retry)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+DNS_CACHE_TTL = 300  # Seconds aiohttp caches host lookups
+MAX_IP_TIMEOUT = 60  # Maximum time per IP
+
+
+class AsyncScannerModule(ScannerModule):
+    """ScannerModule that scans targets with aiohttp instead of a thread pool"""
+
+    def scan_targets(self, valid_ips, pbar, options, jsonl_file=None, csv_file=None):
+        """Scan all IPs on one event loop"""
+        if self.use_bypass and self.bypass_system:
+            # The bypass system manages its own sessions and pacing on threads
+            tqdm.write(f"{YELLOW}[WARN]{RESET} Bypass mode is thread-based, ignoring --async")
+            return super().scan_targets(valid_ips, pbar, options, jsonl_file, csv_file)
+        asyncio.run(self._scan_async(valid_ips, pbar, options, jsonl_file, csv_file))
+
+    async def _scan_async(self, valid_ips, pbar, options, jsonl_file, csv_file):
+        connector = aiohttp.TCPConnector(limit=self.max_workers, ttl_dns_cache=DNS_CACHE_TTL)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        # Reuse an injected session's User-Agent without building a requests session
+        if self._session is not None:
+            user_agent = self._session.headers.get('User-Agent', 'Valac/1.0')
+        else:
+            user_agent = random.choice(self.user_agents)
+        headers = {'User-Agent': user_agent}
+        targets = iter(valid_ips)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            async def worker():
+                # Workers share one iterator, so at most max_workers IPs are in flight
+                for ip in targets:
+                    await self._process_ip_async(session, ip, options, jsonl_file, csv_file)
+                    self.update_progress(pbar)
+
+            await asyncio.gather(*(worker() for _ in range(self.max_workers)))
+
+    async def _get_json(self, session: aiohttp.ClientSession, url: str,
+                        timeout: Optional[float] = None) -> tuple:
+        """GET url and return (status, json), retrying throttled and 5xx responses"""
+        # A per-request timeout replaces the session's; only pass one when asked,
+        # since timeout=None would disable the --timeout limit entirely
+        kwargs = {'timeout': aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        for attempt in range(MAX_RETRIES + 1):
+            async with session.get(url, **kwargs) as resp:
+                if resp.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                if resp.status != 200:
+                    return resp.status, None
+                return resp.status, await resp.json(content_type=None)
+
+    async def _throttle(self):
+        """Space requests out to honour --rps"""
+        now = time.time()
+        wait = max(0.0, self._next_available_time - now)
+        self._next_available_time = max(self._next_available_time, now) + (1.0 / self.requests_per_second)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _fetch_cve_details_async(self, session: aiohttp.ClientSession, cve_id: str):
+        """Populate the CVE cache, storing a placeholder when the lookup fails"""
+        if self.cached_cve_details(cve_id) is not None:
+            return
+        try:
+            status, data = await self._get_json(session, f"https://cvedb.shodan.io/cve/{cve_id}")
+            if status == 200 and data:
+                stored = dict(data)
+                stored['_ts'] = time.time()
+                self.cache[cve_id] = stored
+                return
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            pass
+        if cve_id not in self.cache:
+            # Store placeholder to avoid repeated API calls
+            self.cache[cve_id] = {'_ts': time.time()}
+
+    async def _fetch_geolocation_async(self, session: aiohttp.ClientSession, ip: str) -> Dict[str, Any]:
+        try:
+            status, data = await self._get_json(session, f"http://ip-api.com/json/{ip}", timeout=3)
+            if status == 200 and data:
+                # Normalize field names for consistency
+                return {
+                    'lat': data.get('lat'),
+                    'lon': data.get('lon'),
+                    'city': data.get('city'),
+                    'country': data.get('country'),
+                    'regionName': data.get('regionName'),
+                    'region': data.get('regionName'),
+                    'isp': data.get('isp'),
+                    'org': data.get('org'),
+                    'as': data.get('as'),
+                    'query': data.get('query')
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            # Silently ignore geolocation errors
+            pass
+        return {}
+
+    async def _send_webhook_async(self, session: aiohttp.ClientSession, result: ScanResult):
+        payload = {
+            "ip": result.ip,
+            "severity": result.severity_score,
+            "risk_level": result.risk_level,
+            "vulns_count": len(result.vulns),
+            "vulns": result.vulns[:5],
+            "timestamp": result.timestamp
+        }
+        try:
+            async with session.post(self.webhook_url, json=payload, timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Silently ignore webhook errors to not interrupt scanning
+            pass
+
+    async def _process_ip_async(self, session: aiohttp.ClientSession, ip, options,
+                                jsonl_file=None, csv_file=None):
+        """Async counterpart of ScannerModule.process_ip"""
+        start_time = time.time()
+
+        try:
+            if self.requests_per_second:
+                await self._throttle()
+
+            status, data = await self._get_json(session, f"https://internetdb.shodan.io/{ip}")
+            response_time = time.time() - start_time
+
+            if status != 200:
+                if status == 404:
+                    tqdm.write(f"{YELLOW}[WARN]{RESET} No data found for {ip}")
+                else:
+                    self.stats['errors'] += 1
+                    tqdm.write(f"{RED}[ERROR]{RESET} HTTP {status} for {ip}")
+                return
+
+            # Resolve CVE details concurrently so severity scoring only reads the cache
+            vulns = data.get("vulns", [])
+            if vulns:
+                await asyncio.gather(*(self._fetch_cve_details_async(session, v) for v in vulns))
+
+            geolocation = await self._fetch_geolocation_async(session, ip) if self.enable_geolocation else {}
+            result = self.record_result(ip, data, response_time, geolocation, options, jsonl_file, csv_file)
+
+            if result.risk_level in ["CRITICAL", "HIGH"] and self.webhook_url:
+                await self._send_webhook_async(session, result)
+
+            if self.delay:
+                await asyncio.sleep(self.delay)
+
+            # Check for timeout
+            elapsed = time.time() - start_time
+            if elapsed > MAX_IP_TIMEOUT:
+                self.stats['errors'] += 1
+                tqdm.write(f"{YELLOW}[WARN]{RESET} IP {ip} processing exceeded timeout ({MAX_IP_TIMEOUT}s)")
+
+        except asyncio.TimeoutError:
+            self.stats['errors'] += 1
+            tqdm.write(f"{YELLOW}[WARN]{RESET} Request timeout for {ip}")
+        except aiohttp.ClientConnectionError:
+            self.stats['errors'] += 1
+            tqdm.write(f"{YELLOW}[WARN]{RESET} Connection issue for {ip}")
+        except aiohttp.ClientError as e:
+            self.stats['errors'] += 1
+            tqdm.write(f"{RED}[ERROR]{RESET} Request failed for {ip}: {str(e)[:100]}")
+        except Exception as e:
+            self.stats['errors'] += 1
+            # Limit error message length
+            tqdm.write(f"{RED}[ERROR]{RESET} Unexpected error for {ip}: {str(e)[:200]}")
@@ -11,6 +11,13 @@ import re
 import time
 from typing import List, Set, Optional, Tuple
 from pathlib import Path
+from .dns_cache import resolve
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 # Color codes
 RED = "\033[91m"
@@ -120,8 +127,8 @@ class SecurityValidator:
                 else:
                     return False, f"Target {target} may not be reachable (connection test failed)"
             elif target_type == 'domain':
-                # Try DNS resolution
-                socket.gethostbyname(target)
+                # Try DNS resolution (cached, so the scanner reuses the answer)
+                resolve(target)
                 return True, None
         except socket.timeout:
             return False, f"Target {target} timeout - may be unreachable"
@@ -213,6 +220,11 @@ class BlacklistProtection:
     def __init__(self, blacklist_file: Optional[str] = None):
         self.blacklisted_ips = set()
         self.blacklisted_domains = set()
+        # Lookup structures built by compile()
+        self._exact = None
+        self._networks = {}
+        self._pattern_re = None
+        self._pattern_db = None
         
         if blacklist_file and Path(blacklist_file).exists():
             self.load_blacklist(blacklist_file)
@@ -235,21 +247,91 @@ class BlacklistProtection:
                         self.blacklisted_domains.add(line.lower())
         except Exception as e:
             print(f"{YELLOW}[WARN]{RESET} Failed to load blacklist: {e}")
+        self._exact = None
+    
+    def compile(self):
+        """Build the exact-match set, CIDR list and a single matcher for wildcard entries (e.g. *.gov)"""
+        wildcards = [d for d in self.blacklisted_domains if '*' in d or '?' in d]
+        networks = []
+        for entry in self.blacklisted_domains:
+            if '/' in entry:
+                try:
+                    networks.append(ipaddress.ip_network(entry, strict=False))
+                except ValueError:
+                    pass
+        # Group ranges by prefix length: a lookup is one set probe per distinct prefix length
+        by_prefix = {}
+        for version in (4, 6):
+            for net in ipaddress.collapse_addresses(n for n in networks if n.version == version):
+                by_prefix.setdefault((version, net.prefixlen), set()).add(int(net.network_address))
+        self._networks = {}
+        for (version, prefixlen), addresses in sorted(by_prefix.items()):
+            bits = 32 if version == 4 else 128
+            mask = ((1 << bits) - 1) ^ ((1 << (bits - prefixlen)) - 1)
+            self._networks.setdefault(version, []).append((prefixlen, mask, frozenset(addresses)))
+        self._exact = frozenset(self.blacklisted_ips) | frozenset(self.blacklisted_domains.difference(wildcards))
+        self._pattern_re = None
+        self._pattern_db = None
+        if not wildcards:
+            return
+        
+        patterns = ['^' + re.escape(w).replace(r'\*', '.*').replace(r'\?', '.') + '$' for w in wildcards]
+        if HYPERSCAN_AVAILABLE:
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[p.encode('utf-8') for p in patterns],
+                    ids=list(range(len(patterns))),
+                    elements=len(patterns),
+                    flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS] * len(patterns)
+                )
+                self._pattern_db = db
+                return
+            except Exception as e:
+                print(f"{YELLOW}[WARN]{RESET} Hyperscan compile failed, using regex: {e}")
+        self._pattern_re = re.compile('|'.join(patterns), re.IGNORECASE)
+    
+    def _matches_pattern(self, target: str) -> bool:
+        if self._pattern_db is not None:
+            hits = []
+            
+            def on_match(pattern_id, start, end, flags, context):
+                hits.append(pattern_id)
+            
+            self._pattern_db.scan(target.encode('utf-8'), match_event_handler=on_match)
+            return bool(hits)
+        return bool(self._pattern_re and self._pattern_re.match(target))
     
     def is_blacklisted(self, target: str) -> Tuple[bool, Optional[str]]:
         """Check if target is blacklisted"""
-        # Check IP blacklist
-        try:
-            ip = ipaddress.ip_address(target)
-            if str(ip) in self.blacklisted_ips:
-                return True, f"IP {target} is in blacklist"
-        except ValueError:
-            pass
+        if self._exact is None:
+            self.compile()
+        
+        key = target.lower()
+        ip = None
+        if self._networks or ':' in key:
+            try:
+                ip = ipaddress.ip_address(key)
+                # Normalize IPv6 spellings before the set lookup
+                key = str(ip)
+            except ValueError:
+                pass
         
-        # Check domain blacklist
-        if target.lower() in self.blacklisted_domains:
+        if key in self._exact:
+            if key in self.blacklisted_ips:
+                return True, f"IP {target} is in blacklist"
             return True, f"Domain {target} is in blacklist"
         
+        if ip is not None:
+            value = int(ip)
+            for prefixlen, mask, addresses in self._networks.get(ip.version, ()):
+                if (value & mask) in addresses:
+                    net = ipaddress.ip_network((value & mask, prefixlen))
+                    return True, f"IP {target} is in blacklisted range {net}"
+        
+        if self._matches_pattern(key):
+            return True, f"Domain {target} matches blacklist pattern"
+        
         return False, None
     
     def filter_blacklisted(self, targets: List[str]) -> Tuple[List[str], List[str]]:
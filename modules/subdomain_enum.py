@@ -12,9 +12,11 @@ import re
 import time
 import os
 from pathlib import Path
-from typing import Iterable, List, Optional, Set, Tuple, Dict
+from typing import Callable, Iterable, List, Optional, Set, Tuple, Dict
 from tqdm.asyncio import tqdm as atqdm
 from collections import deque
+from itertools import cycle, islice
+from .wordlist import load_wordlist
 
 try:
     import psutil
@@ -22,6 +24,18 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Color codes
 GREEN = "\033[92m"
 YELLOW = "\033[93m"
@@ -32,7 +46,26 @@ RESET = "\033[0m"
 # Resource limits
 MAX_CONCURRENT_DNS = 500  # Maximum concurrent DNS queries
 MAX_CONCURRENT_HTTP = 200  # Maximum concurrent HTTP requests
+MIN_CONCURRENT_DNS = 32  # Floor for the adaptive DNS concurrency limit
 MEMORY_CHECK_INTERVAL = 500  # Check memory every N operations
+PROGRESS_FLUSH_OPS = 64  # Push progress bar updates every N operations
+PROGRESS_POSTFIX_INTERVAL = 1.0  # Refresh progress bar postfix at most once per N seconds
+
+# HTTP title extraction
+MAX_TITLE_BODY = 100_000  # Bytes of body searched for <title>
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+WHITESPACE_RE = re.compile(r"\s+")
+HEAD_UNSUPPORTED = {405, 501}  # Statuses that mean "retry the probe with GET"
+
+# Adaptive (AIMD) DNS concurrency control
+DNS_AIMD_WINDOW = 500  # Re-evaluate the limit every N queries
+DNS_AIMD_TIMEOUT_RATE = 0.05  # Halve the limit above this timeout fraction
+DNS_AIMD_STEP = 32  # Additive increase per healthy window
+
+# In-process DNS cache: host -> (ips, expiry timestamp)
+DNS_CACHE_MAX_SIZE = 600_000  # Maximum cached hostnames
+DNS_CACHE_TTL = 300  # Seconds before a cached answer is re-resolved
+_DNS_CACHE: Dict[str, Tuple[List[str], float]] = {}
 
 try:
     import dns.resolver
@@ -40,45 +73,189 @@ except ImportError:
     dns = None
 
 
-async def resolve_host(resolver: aiodns.DNSResolver, host: str, timeout: float = 10.0) -> Tuple[str, List[str]]:
-    """Resolve host with timeout protection"""
+def _is_dns_timeout(exc: Exception) -> bool:
+    """Check if a resolver error is a query timeout"""
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    return (isinstance(exc, aiodns.error.DNSError) and bool(exc.args)
+            and exc.args[0] == aiodns.error.ARES_ETIMEOUT)
+
+
+def _is_dns_negative(exc: Exception) -> bool:
+    """Check if a resolver error is an authoritative NXDOMAIN or NODATA answer"""
+    return (isinstance(exc, aiodns.error.DNSError) and bool(exc.args)
+            and exc.args[0] in (aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA))
+
+
+async def resolve_host(resolver: aiodns.DNSResolver, host: str, timeout: float = 10.0) -> Tuple[str, List[str], bool]:
+    """Resolve host with timeout protection
+
+    Returns (host, ips, definitive); definitive is False when a query failed
+    for a transient reason (SERVFAIL, REFUSED, timeout), so an empty answer
+    must not be cached. Raises asyncio.TimeoutError when both the A and AAAA
+    queries time out, so callers can tell an overloaded resolver apart from NXDOMAIN.
+    """
     ips = []
+    timeouts = 0
+    definitive = True
     try:
         # Use asyncio.wait_for for timeout protection
         a_records = await asyncio.wait_for(resolver.query(host, 'A'), timeout=timeout)
         ips.extend([r.host for r in a_records])
-    except asyncio.TimeoutError:
-        pass  # Timeout is expected for non-existent hosts
-    except Exception:
+    except Exception as e:
         # Catch all DNS-related errors (aiodns raises various exceptions)
-        # This includes aiodns.error.DNSError and other DNS errors
-        pass  # DNS error is expected for non-existent hosts
+        # NXDOMAIN and friends are expected for non-existent hosts
+        if _is_dns_timeout(e):
+            timeouts += 1
+        if not _is_dns_negative(e):
+            definitive = False
     
     try:
         aaaa_records = await asyncio.wait_for(resolver.query(host, 'AAAA'), timeout=timeout)
         ips.extend([r.host for r in aaaa_records])
-    except asyncio.TimeoutError:
-        pass
-    except Exception:
+    except Exception as e:
         # Catch all DNS-related errors
-        pass
+        if _is_dns_timeout(e):
+            timeouts += 1
+        if not _is_dns_negative(e):
+            definitive = False
     
-    return host, sorted(set(ips))
-
-
-async def fetch_title(session: aiohttp.ClientSession, url: str, timeout: float = 10.0) -> Tuple[str, Optional[int], Optional[str]]:
-    """Fetch page title with timeout and error handling"""
+    if timeouts == 2:
+        raise asyncio.TimeoutError
+    return host, sorted(set(ips)), definitive
+
+
+class _ProgressBatcher:
+    """Coalesce per-operation progress bar updates into periodic flushes"""
+
+    def __init__(self, pbar, postfix: Callable[[float], Dict[str, str]]):
+        self.pbar = pbar
+        self.postfix = postfix  # Builds the postfix dict from the current rate
+        self.count = 0
+        self.flushed = 0
+        self.start_time = time.monotonic()
+        self.last_postfix = self.start_time
+
+    def tick(self):
+        """Record one finished operation"""
+        self.count += 1
+        now = time.monotonic()
+        postfix_due = now - self.last_postfix > PROGRESS_POSTFIX_INTERVAL
+        if postfix_due or self.count - self.flushed >= PROGRESS_FLUSH_OPS:
+            self.pbar.update(self.count - self.flushed)
+            self.flushed = self.count
+            if postfix_due:
+                self._set_postfix(now)
+
+    def close(self):
+        """Flush pending updates and close the progress bar"""
+        if self.count > self.flushed:
+            self.pbar.update(self.count - self.flushed)
+            self.flushed = self.count
+        self._set_postfix(time.monotonic())
+        self.pbar.close()
+
+    def _set_postfix(self, now: float):
+        elapsed = now - self.start_time
+        rate = self.count / elapsed if elapsed > 0 else 0
+        self.pbar.set_postfix(self.postfix(rate))
+        self.last_postfix = now
+
+
+class _AdaptiveLimiter:
+    """AIMD concurrency limiter driven by the DNS timeout rate
+
+    Every DNS_AIMD_WINDOW queries the limit is halved if too many of them
+    timed out, or grown by DNS_AIMD_STEP if callers were left waiting.
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max_limit
+        self.min_limit = min(MIN_CONCURRENT_DNS, max_limit)
+        self.limit = max_limit
+        self.active = 0
+        self.waiting = 0
+        self.window: deque = deque(maxlen=DNS_AIMD_WINDOW)
+        self.since_adjust = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            self.waiting += 1
+            try:
+                await self._cond.wait_for(lambda: self.active < self.limit)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+
+    async def release(self, timed_out: bool):
+        async with self._cond:
+            self.active -= 1
+            self.window.append(timed_out)
+            self.since_adjust += 1
+            if self.since_adjust >= DNS_AIMD_WINDOW:
+                self.since_adjust = 0
+                self._adjust()
+            self._cond.notify(max(1, self.limit - self.active))
+
+    def _adjust(self):
+        rate = sum(self.window) / len(self.window)
+        if rate > DNS_AIMD_TIMEOUT_RATE:
+            self.limit = max(self.min_limit, self.limit // 2)
+        elif self.waiting and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + DNS_AIMD_STEP)
+
+
+def _dns_cache_get(host: str) -> Optional[List[str]]:
+    """Return cached IPs for host (possibly empty), or None on miss/expiry"""
+    hit = _DNS_CACHE.get(host)
+    if hit is None:
+        return None
+    if hit[1] <= time.time():
+        del _DNS_CACHE[host]
+        return None
+    return hit[0]
+
+
+def _dns_cache_put(host: str, ips: List[str]):
+    """Store a resolution result, evicting the oldest 10% when full"""
+    if len(_DNS_CACHE) >= DNS_CACHE_MAX_SIZE:
+        # Dicts keep insertion order, so the first keys are the oldest entries
+        for key in list(islice(_DNS_CACHE, DNS_CACHE_MAX_SIZE // 10)):
+            del _DNS_CACHE[key]
+    _DNS_CACHE[host] = (ips, time.time() + DNS_CACHE_TTL)
+
+
+async def _read_title(resp: aiohttp.ClientResponse) -> str:
+    """Extract the page title from the first 100KB of a response body"""
+    # Search the raw bytes so the body is never decoded into a str;
+    # only the captured title gets decoded
+    buf = bytearray()
+    while len(buf) < MAX_TITLE_BODY:
+        chunk = await resp.content.read(MAX_TITLE_BODY - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    m = TITLE_RE.search(buf)
+    title = m.group(1).decode("utf-8", "ignore").strip() if m else ""
+    return WHITESPACE_RE.sub(" ", title)[:200]
+
+
+async def fetch_title(session: aiohttp.ClientSession, url: str) -> Tuple[str, Optional[int], Optional[str]]:
+    """Fetch page title with timeout and error handling
+
+    A HEAD preflight is sent first; the body is only downloaded for 200
+    text/html responses, or when the server does not support HEAD.
+    Both requests use the session's timeout (including its connect limit).
+    """
     try:
-        async with asyncio.wait_for(session.get(url, allow_redirects=False), timeout=timeout) as resp:
+        async with session.head(url, allow_redirects=False) as resp:
             code = resp.status
-            # Limit response size
-            text = await resp.text(errors="ignore")
-            if len(text) > 100000:  # Limit to 100KB for title extraction
-                text = text[:100000]
-            m = re.search(r"<title[^>]*>(.*?)</title>", text, re.IGNORECASE | re.DOTALL)
-            title = m.group(1).strip() if m else ""
-            title = re.sub(r"\s+", " ", title)[:200]
-            return url, code, title
+            ctype = resp.headers.get("Content-Type", "")
+        if code not in HEAD_UNSUPPORTED and not (code == 200 and ctype.startswith("text/html")):
+            return url, code, ""
+        async with session.get(url, allow_redirects=False) as resp:
+            return url, resp.status, await _read_title(resp)
     except asyncio.TimeoutError:
         return url, None, None
     except aiohttp.ClientError:
@@ -87,6 +264,14 @@ async def fetch_title(session: aiohttp.ClientSession, url: str, timeout: float =
         return url, None, None
 
 
+async def probe_host(session: aiohttp.ClientSession, host: str) -> Tuple[str, Optional[int], Optional[str]]:
+    """Probe host over HTTPS, falling back to plain HTTP only if HTTPS fails"""
+    url, code, title = await fetch_title(session, f"https://{host}")
+    if code is None:
+        url, code, title = await fetch_title(session, f"http://{host}")
+    return url, code, title
+
+
 async def http_inventory(hosts: List[str], concurrency: int, timeout: int) -> List[Tuple[str, Optional[int], Optional[str]]]:
     """HTTP inventory with resource management"""
     # Limit concurrency
@@ -105,53 +290,53 @@ async def http_inventory(hosts: List[str], concurrency: int, timeout: int) -> Li
     )
     tout = aiohttp.ClientTimeout(total=timeout, connect=5)
     headers = {"User-Agent": "Valac/1.0"}
-    out = []
-    total = len(hosts) * 2  # HTTP + HTTPS
-    request_count = 0
-    start_time = time.time()
+    total = len(hosts)
+    found_count = 0
     
     pbar = atqdm(
         total=total,
         desc=f"{YELLOW}[SUBDOMAIN]{RESET} HTTP inventory",
-        unit="request",
+        unit="host",
         bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
         colour='blue'
     )
+    progress = _ProgressBatcher(pbar, lambda rate: {
+        'Found': found_count,
+        'Rate': f"{rate:.1f}/s"
+    })
+
+    results: List[Optional[Tuple[str, Optional[int], Optional[str]]]] = [None] * total
 
     async with aiohttp.ClientSession(connector=connector, timeout=tout, headers=headers) as session:
-        # Process in batches to manage memory
-        batch_size = actual_concurrency * 2
-        for i in range(0, len(hosts), batch_size):
-            batch_hosts = hosts[i:i+batch_size]
-            tasks = []
-            for h in batch_hosts:
-                tasks.append(fetch_title(session, f"https://{h}"))
-                tasks.append(fetch_title(session, f"http://{h}"))
-            
-            # Process batch with semaphore
-            sem = asyncio.Semaphore(actual_concurrency * 2)
-            async def bounded_task(task):
-                async with sem:
-                    return await task
-            
-            results = await asyncio.gather(*[bounded_task(t) for t in tasks], return_exceptions=True)
-            
-            for r in results:
-                if isinstance(r, tuple):
-                    out.append(r)
-                request_count += 1
-                pbar.update(1)
-                
-                # Periodic stats update
-                if request_count % 50 == 0:
-                    elapsed = time.time() - start_time
-                    rate = request_count / elapsed if elapsed > 0 else 0
-                    pbar.set_postfix({
-                        'Found': sum(1 for _, c, _ in out if c is not None),
-                        'Rate': f"{rate:.1f}/s"
-                    })
+        # Keep exactly as many requests in flight as the connector can serve and
+        # refill as each one finishes, so there are no batch-boundary stalls and
+        # queued requests don't burn their timeout waiting for a pooled connection
+        pending = set()
+        task_index: Dict[asyncio.Task, int] = {}
+        jobs = iter(enumerate(hosts))
+
+        def schedule(n: int):
+            for idx, host in islice(jobs, n):
+                t = asyncio.create_task(probe_host(session, host))
+                task_index[t] = idx
+                pending.add(t)
+
+        schedule(max_connections)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            schedule(len(done))
+            for t in done:
+                idx = task_index.pop(t)
+                if not t.cancelled() and t.exception() is None:
+                    r = t.result()
+                    results[idx] = r
+                    if r[1] is not None:
+                        found_count += 1
+                progress.tick()
     
-    pbar.close()
+    # Preserve the host order of the input rather than completion order
+    out = [r for r in results if r is not None]
+    progress.close()
     return out
 
 
@@ -159,6 +344,7 @@ CRT_URL = "https://crt.sh/?q=%25.{domain}&output=json"
 
 
 async def fetch_crtsh(domain: str) -> Set[str]:
+    """Collect names for domain from Certificate Transparency logs"""
     names: Set[str] = set()
     timeout = aiohttp.ClientTimeout(total=30)
     headers = {"User-Agent": "Valac/1.0"}
@@ -166,35 +352,31 @@ async def fetch_crtsh(domain: str) -> Set[str]:
         async with session.get(CRT_URL.format(domain=domain)) as resp:
             if resp.status != 200:
                 return names
-            try:
-                data = await resp.json(content_type=None)
-            except Exception:
-                text = await resp.text()
-                try:
-                    data = json.loads(text)
-                except Exception:
-                    return names
-            for row in data:
-                v = row.get("name_value") or ""
-                v = v.replace("*.", "")
-                for part in v.splitlines():
-                    part = part.strip().lower()
-                    if part.endswith("." + domain) or part == domain:
-                        names.add(part)
+            raw = await resp.read()
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    try:
+        data = loads(raw)
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
+        # crt.sh answers overload with an HTML error page instead of a JSON array
+        return names
+    if not isinstance(data, list):
+        return names
+    domain = domain.lower()
+    suffix = "." + domain
+    for row in data:
+        v = row.get("name_value")
+        if not v:
+            continue
+        if "*." in v:
+            v = v.replace("*.", "")
+        # strip() also drops a trailing "\r" from CRLF-separated values
+        for part in v.split("\n"):
+            part = part.strip().lower()
+            if part == domain or part.endswith(suffix):
+                names.add(part)
     return names
 
 
-def load_wordlist(path: Path) -> List[str]:
-    out = []
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            w = line.strip()
-            if not w or w.startswith("#"):
-                continue
-            out.append(w)
-    return out
-
-
 async def validate_hosts(hosts: Iterable[str], concurrency: int, resolvers: Optional[List[str]]) -> Dict[str, List[str]]:
     """Validate hosts with resource management"""
     # Limit concurrency to prevent resource exhaustion
@@ -202,18 +384,22 @@ async def validate_hosts(hosts: Iterable[str], concurrency: int, resolvers: Opti
     if concurrency > MAX_CONCURRENT_DNS:
         print(f"{YELLOW}[INFO]{RESET} Concurrency limited to {actual_concurrency} (max: {MAX_CONCURRENT_DNS})")
     
-    r = aiodns.DNSResolver()
+    # One resolver per upstream server so load is spread round-robin instead
+    # of c-ares sending everything to the first nameserver
     if resolvers:
-        r.nameservers = resolvers
+        resolver_pool = [aiodns.DNSResolver(nameservers=[ip]) for ip in resolvers]
+    else:
+        resolver_pool = [aiodns.DNSResolver()]
+    per_resolver = max(1, actual_concurrency // len(resolver_pool))
+    resolver_sems = [asyncio.Semaphore(per_resolver) for _ in resolver_pool]
+    next_resolver = cycle(range(len(resolver_pool)))
     
-    # Use semaphore for rate limiting
-    sem = asyncio.Semaphore(actual_concurrency)
+    # Adaptive limiter backs off when the resolver starts timing out
+    limiter = _AdaptiveLimiter(actual_concurrency)
     results: Dict[str, List[str]] = {}
-    operation_count = 0
     
     hosts_list = list(hosts)
     total = len(hosts_list)
-    start_time = time.time()
     
     pbar = atqdm(
         total=total,
@@ -222,48 +408,55 @@ async def validate_hosts(hosts: Iterable[str], concurrency: int, resolvers: Opti
         bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
         colour='yellow'
     )
+    progress = _ProgressBatcher(pbar, lambda rate: {
+        'Valid': len(results),
+        'Rate': f"{rate:.1f}/s",
+        'Conc': limiter.limit
+    })
 
     async def task(h: str):
-        nonlocal operation_count
-        async with sem:
-            try:
-                host, ips = await asyncio.wait_for(resolve_host(r, h), timeout=10.0)
-                if ips:
-                    results[host] = ips
-            except asyncio.TimeoutError:
-                pass
-            except Exception:
-                pass
-            finally:
-                operation_count += 1
-                pbar.update(1)
-                
-                # Periodic memory check
-                if PSUTIL_AVAILABLE and operation_count % MEMORY_CHECK_INTERVAL == 0:
-                    try:
-                        process = psutil.Process(os.getpid())
-                        memory_mb = process.memory_info().rss / 1024 / 1024
-                        if memory_mb > 2048:  # Warn if > 2GB
-                            print(f"\n{YELLOW}[WARN]{RESET} High memory usage: {memory_mb:.1f}MB")
-                    except (OSError, AttributeError):
-                        # Silently ignore memory check errors
-                        pass
-                
-                elapsed = time.time() - start_time
-                rate = operation_count / elapsed if elapsed > 0 else 0
-                pbar.set_postfix({
-                    'Valid': len(results),
-                    'Rate': f"{rate:.1f}/s"
-                })
-
-    # Process in batches to prevent memory issues
-    batch_size = actual_concurrency * 2
-    for i in range(0, len(hosts_list), batch_size):
-        batch = hosts_list[i:i+batch_size]
-        tasks = [asyncio.create_task(task(h)) for h in batch]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        cached = _dns_cache_get(h)
+        if cached is not None:
+            if cached:
+                results[h] = cached
+            progress.tick()
+            return
+        await limiter.acquire()
+        timed_out = False
+        idx = next(next_resolver)
+        try:
+            async with resolver_sems[idx]:
+                host, ips, definitive = await asyncio.wait_for(resolve_host(resolver_pool[idx], h), timeout=10.0)
+            # Empty answers are only cached when both queries returned NXDOMAIN/NODATA
+            if ips or definitive:
+                _dns_cache_put(host, ips)
+            if ips:
+                results[host] = ips
+        except asyncio.TimeoutError:
+            timed_out = True
+        except Exception:
+            pass
+        finally:
+            await limiter.release(timed_out)
+            progress.tick()
+            
+            # Periodic memory check
+            if PSUTIL_AVAILABLE and progress.count % MEMORY_CHECK_INTERVAL == 0:
+                try:
+                    process = psutil.Process(os.getpid())
+                    memory_mb = process.memory_info().rss / 1024 / 1024
+                    if memory_mb > 2048:  # Warn if > 2GB
+                        print(f"\n{YELLOW}[WARN]{RESET} High memory usage: {memory_mb:.1f}MB")
+                except (OSError, AttributeError):
+                    # Silently ignore memory check errors
+                    pass
+
+    # The limiter bounds in-flight queries, so every host can be scheduled up
+    # front without waiting for a batch to drain
+    tasks = [asyncio.create_task(task(h)) for h in hosts_list]
+    await asyncio.gather(*tasks, return_exceptions=True)
     
-    pbar.close()
+    progress.close()
     return results
 
 
@@ -274,9 +467,9 @@ def write_list(path: Path, items: Iterable[str]):
 
 
 def write_resolved(path: Path, mapping: Dict[str, List[str]]):
-    with path.open("w", encoding="utf-8") as f:
-        for h, ips in sorted(mapping.items()):
-            f.write(h + " " + " ".join(ips) + "\n")
+    # Build the whole payload first and hand it to the OS in one binary write
+    lines = [f"{h} {' '.join(ips)}\n" for h, ips in sorted(mapping.items())]
+    path.write_bytes("".join(lines).encode("utf-8"))
 
 
 class SubdomainEnumModule:
@@ -297,11 +490,14 @@ class SubdomainEnumModule:
             raw |= names
         elif args.subdomain_mode == "brute":
             print(f"{YELLOW}[INFO]{RESET} Loading wordlist...")
-            wordlist_path = Path(args.wordlist)
-            if not wordlist_path.exists():
-                print(f"{RED}[ERROR]{RESET} Wordlist file not found: {args.wordlist}")
-                return
-            words = load_wordlist(wordlist_path)
+            # valac.py preloads the wordlist; fall back to reading it here
+            words = getattr(args, "wordlist_data", None)
+            if words is None:
+                wordlist_path = Path(args.wordlist)
+                if not wordlist_path.exists():
+                    print(f"{RED}[ERROR]{RESET} Wordlist file not found: {args.wordlist}")
+                    return
+                words = load_wordlist(wordlist_path)
             if not words:
                 print(f"{RED}[ERROR]{RESET} Wordlist is empty or invalid")
                 return
@@ -355,6 +551,9 @@ class SubdomainEnumModule:
         print(f"{GREEN}[SUCCESS]{RESET} Results saved to {outdir}")
 
     def run(self, args):
+        # uvloop's libuv-based loop cuts per-task overhead for the DNS/HTTP workers
+        if UVLOOP_AVAILABLE:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         try:
             asyncio.run(self.run_async(args))
         except KeyboardInterrupt:
@@ -3,39 +3,77 @@ Visualization Module - Interactive Dashboard Generator
 Creates interactive HTML dashboards with charts, maps, and tables
 """
 
+import os
 import json
+import gzip
+import hashlib
 import datetime
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 from pathlib import Path
+import requests
+from jinja2 import Environment, BaseLoader, Template
+from markupsafe import escape
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class DashboardGenerator:
-    """Generate interactive HTML dashboards"""
-    
-    def __init__(self):
-        self.template = self._get_template()
-    
-    def _get_template(self) -> str:
-        """Get HTML template with all libraries"""
-        return """<!DOCTYPE html>
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+NUMPY_MIN_ROWS = 1000  # Use vectorized coordinate validation above this many results
+MAX_INLINE_ROWS = 1000  # Table rows embedded in the HTML; larger scans get a JSON sidecar
+
+# Front-end libraries in load order: Chart.js, Leaflet (+ glify), jQuery, DataTables (+ Scroller)
+ASSETS = [
+    ('js', 'https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js'),
+    ('css', 'https://unpkg.com/leaflet@1.9.4/dist/leaflet.css'),
+    ('js', 'https://unpkg.com/leaflet@1.9.4/dist/leaflet.js'),
+    ('js', 'https://unpkg.com/leaflet.glify@3.3.0/dist/glify-browser.js'),
+    ('css', 'https://cdn.datatables.net/1.13.7/css/jquery.dataTables.min.css'),
+    ('js', 'https://code.jquery.com/jquery-3.7.0.min.js'),
+    ('js', 'https://cdn.datatables.net/1.13.7/js/jquery.dataTables.min.js'),
+    ('css', 'https://cdn.datatables.net/scroller/2.3.0/css/scroller.dataTables.min.css'),
+    ('js', 'https://cdn.datatables.net/scroller/2.3.0/js/dataTables.scroller.min.js'),
+]
+ASSETS_DIR = Path(__file__).parent / 'assets'  # Optional bundled copies, named after the URL basename
+ASSET_FETCH_TIMEOUT = 15
+GZIP_LEVEL = 6
+WRITE_BUFFER_BYTES = 4 * 1024 * 1024  # Encoded output buffered before each write
+BROTLI_QUALITY = 6
+
+# HTML template with all libraries (Jinja2 syntax)
+_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Valac Security Scan Dashboard</title>
     
-    <!-- Chart.js -->
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-    
-    <!-- Leaflet for maps -->
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    
-    <!-- DataTables for interactive tables -->
-    <link rel="stylesheet" href="https://cdn.datatables.net/1.13.7/css/jquery.dataTables.min.css">
-    <script src="https://code.jquery.com/jquery-3.7.0.min.js"></script>
-    <script src="https://cdn.datatables.net/1.13.7/js/jquery.dataTables.min.js"></script>
-    
+    {% for kind, url, body in assets %}{% if body is none %}{% if kind == 'css' %}<link rel="stylesheet" href="{{ url }}">
+    {% else %}<script src="{{ url }}"></script>
+    {% endif %}{% elif kind == 'css' %}<style>{{ body }}</style>
+    {% else %}<script>{{ body }}</script>
+    {% endif %}{% endfor %}
     <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
         body {
@@ -97,6 +135,10 @@ class DashboardGenerator:
         .section {
             margin-bottom: 40px;
         }
+        .table-note {
+            color: #666;
+            margin-bottom: 15px;
+        }
         .section-title {
             font-size: 1.8em;
             color: #333;
@@ -160,32 +202,32 @@ class DashboardGenerator:
     <div class="container">
         <div class="header">
             <h1>🔍 Valac Security Scan Dashboard</h1>
-            <div class="subtitle">Scan Date: {scan_date}</div>
+            <div class="subtitle">Scan Date: {{ scan_date }}</div>
         </div>
         
         <div class="stats-grid">
             <div class="stat-card">
-                <h3>{total_targets}</h3>
+                <h3>{{ total_targets }}</h3>
                 <p>Total Targets</p>
             </div>
             <div class="stat-card critical">
-                <h3>{critical_count}</h3>
+                <h3>{{ critical_count }}</h3>
                 <p>Critical Risk</p>
             </div>
             <div class="stat-card high">
-                <h3>{high_count}</h3>
+                <h3>{{ high_count }}</h3>
                 <p>High Risk</p>
             </div>
             <div class="stat-card medium">
-                <h3>{medium_count}</h3>
+                <h3>{{ medium_count }}</h3>
                 <p>Medium Risk</p>
             </div>
             <div class="stat-card low">
-                <h3>{low_count}</h3>
+                <h3>{{ low_count }}</h3>
                 <p>Low Risk</p>
             </div>
             <div class="stat-card">
-                <h3>{total_vulns}</h3>
+                <h3>{{ total_vulns }}</h3>
                 <p>Vulnerabilities</p>
             </div>
         </div>
@@ -211,10 +253,11 @@ class DashboardGenerator:
             </div>
         </div>
         
-        {map_section}
+        {{ map_section }}
         
         <div class="section">
             <h2 class="section-title">Scan Results</h2>
+            {% if results_url %}<p class="table-note" id="tableNote">Showing the first {{ inline_rows }} of {{ total_targets }} results; the rest load from {{ results_url }} next to this file.</p>{% endif %}
             <table id="resultsTable" class="display">
                 <thead>
                     <tr>
@@ -227,9 +270,7 @@ class DashboardGenerator:
                         <th>Location</th>
                     </tr>
                 </thead>
-                <tbody>
-                    {table_rows}
-                </tbody>
+                <tbody></tbody>
             </table>
         </div>
         
@@ -241,137 +282,352 @@ class DashboardGenerator:
     <script>
         // Risk Level Chart
         const riskCtx = document.getElementById('riskChart').getContext('2d');
-        new Chart(riskCtx, {{
+        new Chart(riskCtx, {
             type: 'doughnut',
-            data: {{
+            data: {
                 labels: ['Critical', 'High', 'Medium', 'Low'],
-                datasets: [{{
-                    data: [{critical_count}, {high_count}, {medium_count}, {low_count}],
+                datasets: [{
+                    data: [{{ critical_count }}, {{ high_count }}, {{ medium_count }}, {{ low_count }}],
                     backgroundColor: [
                         '#f5576c',
                         '#fa709a',
                         '#4facfe',
                         '#43e97b'
                     ]
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
                 maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{
+                plugins: {
+                    legend: {
                         position: 'right'
-                    }},
-                    title: {{
+                    },
+                    title: {
                         display: true,
                         text: 'Risk Level Distribution'
-                    }}
-                }}
-            }}
-        }});
+                    }
+                }
+            }
+        });
         
         // Vulnerability Chart
         const vulnCtx = document.getElementById('vulnChart').getContext('2d');
-        new Chart(vulnCtx, {{
+        new Chart(vulnCtx, {
             type: 'bar',
-            data: {{
-                labels: {vuln_labels},
-                datasets: [{{
+            data: {
+                labels: {{ vuln_labels }},
+                datasets: [{
                     label: 'Vulnerabilities',
-                    data: {vuln_data},
+                    data: {{ vuln_data }},
                     backgroundColor: '#667eea'
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
                 maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{
+                plugins: {
+                    legend: {
                         display: false
-                    }},
-                    title: {{
+                    },
+                    title: {
                         display: true,
                         text: 'Top 10 CVEs'
-                    }}
-                }},
-                scales: {{
-                    y: {{
+                    }
+                },
+                scales: {
+                    y: {
                         beginAtZero: true
-                    }}
-                }}
-            }}
-        }});
+                    }
+                }
+            }
+        });
         
         // Ports Chart
         const portCtx = document.getElementById('portChart').getContext('2d');
-        new Chart(portCtx, {{
+        new Chart(portCtx, {
             type: 'bar',
-            data: {{
-                labels: {port_labels},
-                datasets: [{{
+            data: {
+                labels: {{ port_labels }},
+                datasets: [{
                     label: 'Open Ports',
-                    data: {port_data},
+                    data: {{ port_data }},
                     backgroundColor: '#764ba2'
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
                 maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{
+                plugins: {
+                    legend: {
                         display: false
-                    }},
-                    title: {{
+                    },
+                    title: {
                         display: true,
                         text: 'Top 10 Open Ports'
-                    }}
-                }},
-                scales: {{
-                    y: {{
+                    }
+                },
+                scales: {
+                    y: {
                         beginAtZero: true
-                    }}
-                }}
-            }}
-        }});
+                    }
+                }
+            }
+        });
+        
+        {{ map_script }}
         
-        {map_script}
+        // Table rows are rendered client-side from this array
+        const RESULTS = [{% for row in table_rows %}{{ row }},{% endfor %}];
+        // Sidecar with the full result set when only the first rows are inline
+        const RESULTS_URL = {{ results_url_js }};
+        
+        function riskBadge(risk, type, row) {
+            if (type !== 'display') return risk;
+            return '<span class="badge ' + row.risk_class + '">' + risk + '</span>';
+        }
         
         // Initialize DataTable
-        $(document).ready(function() {{
-            $('#resultsTable').DataTable({{
+        $(document).ready(function() {
+            const table = $('#resultsTable').DataTable({
+                data: RESULTS,
+                columns: [
+                    { data: 'ip' },
+                    { data: 'risk', render: riskBadge },
+                    { data: 'severity', render: (v, type) => type === 'display' ? v.toFixed(1) : v },
+                    { data: 'ports' },
+                    { data: 'vulns' },
+                    { data: 'hostnames' },
+                    { data: 'location' }
+                ],
                 order: [[2, 'desc']],
-                pageLength: 25,
-                responsive: true,
-                columnDefs: [
-                    {{ targets: [1], orderable: true }},
-                    {{ targets: [2], orderable: true }}
-                ]
-            }});
-        }});
+                deferRender: true,
+                scroller: true,
+                scrollY: 600,
+                scrollCollapse: true
+            });
+            
+            if (RESULTS_URL) {
+                fetch(RESULTS_URL)
+                    .then(resp => resp.json())
+                    .then(rows => {
+                        table.clear().rows.add(rows).draw();
+                        $('#tableNote').remove();
+                    })
+                    // Browsers may block fetch() for file:// pages; the inline rows stay in place
+                    .catch(err => console.warn('Could not load ' + RESULTS_URL, err));
+            }
+        });
     </script>
 </body>
 </html>"""
+
+_TEMPLATE_DIGEST = hashlib.blake2b(_TEMPLATE.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert NumPy arrays for the stdlib json fallback"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize obj to compact JSON safe to embed in a <script> block"""
+    if ORJSON_AVAILABLE:
+        # NumPy arrays are serialized natively, without an intermediate list
+        data = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    else:
+        data = json.dumps(obj, separators=(',', ':'), default=_json_default)
+    # "<" only occurs inside strings; escaping it stops "</script>" or "<!--" ending the block
+    return data.replace('<', '\\u003c')
+
+
+@lru_cache(maxsize=None)
+def _load_asset(url: str):
+    """Return asset text from the bundled copy or the CDN, or None if unavailable"""
+    local = ASSETS_DIR / url.rsplit('/', 1)[-1]
+    try:
+        if local.is_file():
+            body = local.read_text(encoding='utf-8')
+        else:
+            resp = requests.get(url, timeout=ASSET_FETCH_TIMEOUT)
+            resp.raise_for_status()
+            body = resp.text
+    except Exception as e:
+        print(f"{YELLOW}[WARNING]{RESET} Could not inline {url}, falling back to CDN link: {e}")
+        return None
+    # Keep inlined code from closing its own <script>/<style> element early
+    return body.replace('</script', '<\\/script').replace('</style', '<\\/style')
+
+
+class _BrotliWriter:
+    """Text sink that brotli-compresses chunks as they are written"""
+    
+    def __init__(self, path: str):
+        self._file = open(path, 'wb')
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    
+    def write(self, text: str):
+        self._file.write(self._compressor.process(text.encode('utf-8')))
+    
+    def writelines(self, chunks):
+        for chunk in chunks:
+            self.write(chunk)
+    
+    def close(self):
+        self._file.write(self._compressor.finish())
+        self._file.close()
+    
+    def __enter__(self):
+        return self
     
-    def generate(self, results: List[Dict], output_file: str):
-        """Generate interactive dashboard from scan results"""
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_output(output_file: str):
+    """Open the dashboard sink, compressing for .gz / .br file names"""
+    if output_file.endswith('.gz'):
+        return gzip.open(output_file, 'wt', compresslevel=GZIP_LEVEL, encoding='utf-8')
+    if output_file.endswith('.br'):
+        if not BROTLI_AVAILABLE:
+            raise RuntimeError("brotli is required for .br output (pip install brotli)")
+        return _BrotliWriter(output_file)
+    # Plain buffered file: chunks are encoded on write and flushed in large blocks
+    return open(output_file, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_BYTES)
+
+
+@lru_cache(maxsize=None)
+def _get_compiled() -> Template:
+    """Compile the dashboard template once per process"""
+    env = Environment(loader=BaseLoader(), autoescape=False)
+    return env.from_string(_TEMPLATE)
+
+
+@dataclass
+class Row:
+    """Results table row with display strings computed once per result"""
+    __slots__ = ('ip', 'risk', 'risk_class', 'severity', 'ports_str', 'vulns_str', 'hostnames_str', 'location')
+    ip: str
+    risk: str
+    risk_class: str
+    severity: float
+    ports_str: str
+    vulns_str: str
+    hostnames_str: str
+    location: str
+    
+    @classmethod
+    def from_dict(cls, result: Dict) -> 'Row':
+        """Build a row from a scan result dict, escaping scan data for HTML"""
+        # Bind each list once per row
+        ports = result.get('ports') or []
+        vulns = result.get('vulns') or []
+        hostnames = result.get('hostnames') or []
+        
+        ports_str = ', '.join(map(str, ports[:5]))
+        if len(ports) > 5:
+            ports_str += f" (+{len(ports) - 5} more)"
+        vulns_str = ', '.join(vulns[:3])
+        if len(vulns) > 3:
+            vulns_str += f" (+{len(vulns) - 3} more)"
+        hostnames_str = ', '.join(hostnames[:2])
+        if len(hostnames) > 2:
+            hostnames_str += "..."
+        
+        # Get location
+        location = "N/A"
+        geo = result.get('geolocation')
+        if geo:
+            city = geo.get('city')
+            country = geo.get('country')
+            if city and country:
+                location = f"{city}, {country}"
+            elif country:
+                location = country
+        
+        # Cells are rendered as HTML by DataTables, so scan data is escaped first
+        risk = escape(result.get('risk_level', 'UNKNOWN'))
+        return cls(
+            ip=escape(result.get('ip', '')),
+            risk=risk,
+            risk_class=risk.lower(),
+            severity=round(float(result.get('severity_score', 0)), 1),
+            ports_str=escape(ports_str) or 'None',
+            vulns_str=escape(vulns_str) or 'None',
+            hostnames_str=escape(hostnames_str) or 'None',
+            location=escape(location)
+        )
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Return the DataTables row object"""
+        return {
+            'ip': self.ip,
+            'risk': self.risk,
+            'risk_class': self.risk_class,
+            'severity': self.severity,
+            'ports': self.ports_str,
+            'vulns': self.vulns_str,
+            'hostnames': self.hostnames_str,
+            'location': self.location
+        }
+
+
+class DashboardGenerator:
+    """Generate interactive HTML dashboards"""
+    
+    def __init__(self, inline_assets: bool = False):
+        self.template = _get_compiled()
+        self.inline_assets = inline_assets
+    
+    def generate(self, results: List[Dict], output_file: str, max_inline_rows: int = MAX_INLINE_ROWS) -> bool:
+        """Generate interactive dashboard from scan results; False if nothing was written"""
         if not results:
-            return
+            return False
         
-        # Calculate statistics
-        stats = self._calculate_stats(results)
+        # Identical results, options and template reproduce the same dashboard, so skip re-rendering
+        digest = self._results_digest(results, max_inline_rows)
+        digest_file = Path(f"{output_file}.digest")
+        needs_sidecar = len(results) > max_inline_rows
+        if (Path(output_file).exists() and digest_file.exists()
+                and (not needs_sidecar or self._sidecar_path(output_file).exists())
+                and digest_file.read_text().strip() == digest):
+            print(f"{GREEN}[INFO]{RESET} Results unchanged, keeping existing dashboard {output_file}")
+            return False
+        
+        # Calculate statistics and chart counts in a single pass
+        stats, vuln_count, port_count = self._aggregate(results)
         
         # Prepare data for charts
-        vuln_data = self._get_vulnerability_data(results)
-        port_data = self._get_port_data(results)
+        vuln_data = self._get_vulnerability_data(vuln_count)
+        port_data = self._get_port_data(port_count)
         
         # Generate map
         map_section, map_script = self._generate_map(results)
         
-        # Generate table rows
-        table_rows = self._generate_table_rows(results)
+        # Normalize results into display rows once for the inline table and the sidecar
+        rows = [Row.from_dict(r) for r in results]
+        
+        # Large scans keep only the first rows inline and put the full set in a sidecar file
+        results_url = None
+        inline_rows = len(results)
+        if needs_sidecar:
+            results_url = self._write_results_sidecar(rows, output_file)
+            inline_rows = max_inline_rows
+        
+        # Table rows are serialized lazily while the template streams out
+        table_rows = self._generate_table_data(islice(rows, inline_rows))
         
-        # Format template
-        html = self.template.format(
+        # Inlined assets make the file self-contained; anything unavailable stays a CDN link
+        assets = [
+            (kind, url, _load_asset(url) if self.inline_assets else None)
+            for kind, url in ASSETS
+        ]
+        
+        # Render template
+        stream = self.template.generate(
+            assets=assets,
             scan_date=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             total_targets=len(results),
             critical_count=stats['critical'],
@@ -379,21 +635,74 @@ class DashboardGenerator:
             medium_count=stats['medium'],
             low_count=stats['low'],
             total_vulns=stats['total_vulns'],
-            vuln_labels=json.dumps(vuln_data['labels']),
-            vuln_data=json.dumps(vuln_data['data']),
-            port_labels=json.dumps(port_data['labels']),
-            port_data=json.dumps(port_data['data']),
+            vuln_labels=_dumps(vuln_data['labels']),
+            vuln_data=_dumps(vuln_data['data']),
+            port_labels=_dumps(port_data['labels']),
+            port_data=_dumps(port_data['data']),
             map_section=map_section,
             map_script=map_script,
-            table_rows=table_rows
+            table_rows=table_rows,
+            inline_rows=inline_rows,
+            results_url=escape(results_url or ''),
+            results_url_js=_dumps(results_url)
         )
         
-        # Save to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
+        # Drop the old digest first so an interrupted render is never mistaken for a complete one
+        digest_file.unlink(missing_ok=True)
+        # Write chunks as they are rendered instead of building the whole page
+        with _open_output(output_file) as f:
+            f.writelines(stream)
+        digest_file.write_text(digest)
+        return True
+    
+    def _results_digest(self, results: List[Dict], max_inline_rows: int) -> str:
+        """Hash results and rendering options into a content digest"""
+        payload = {
+            'results': results,
+            'inline_assets': self.inline_assets,
+            'max_inline_rows': max_inline_rows,
+            # A changed template (e.g. after an upgrade) must re-render the dashboard
+            'template': _TEMPLATE_DIGEST
+        }
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        else:
+            data = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        if BLAKE3_AVAILABLE:
+            return 'blake3:' + blake3.blake3(data).hexdigest()
+        return 'blake2b:' + hashlib.blake2b(data).hexdigest()
     
-    def _calculate_stats(self, results: List[Dict]) -> Dict:
-        """Calculate statistics from results"""
+    def _sidecar_path(self, output_file: str) -> Path:
+        """Return the sidecar path next to output_file (dash.html -> dash.results.json)"""
+        path = Path(output_file)
+        name = path.name
+        # Keep the compression suffix so dash.html, dash.html.gz and dash.html.br
+        # each get their own sidecar (dash.gz.results.json, dash.br.results.json)
+        compression = ''
+        for suffix in ('.gz', '.br'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                compression = suffix
+        for suffix in ('.html', '.htm'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        return path.with_name(f"{name}{compression}.results.json")
+    
+    def _write_results_sidecar(self, rows: List['Row'], output_file: str) -> str:
+        """Write all table rows to <name>.results.json and return its relative URL"""
+        sidecar = self._sidecar_path(output_file)
+        
+        with open(sidecar, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for i, row in enumerate(self._generate_table_data(rows)):
+                if i:
+                    f.write(',')
+                f.write(row)
+            f.write(']')
+        return sidecar.name
+    
+    def _aggregate(self, results: List[Dict]) -> Tuple[Dict, Counter, Counter]:
+        """Calculate risk statistics and vulnerability/port counts in one pass"""
         stats = {
             'critical': 0,
             'high': 0,
@@ -401,6 +710,8 @@ class DashboardGenerator:
             'low': 0,
             'total_vulns': 0
         }
+        vuln_count: Counter = Counter()
+        port_count: Counter = Counter()
         
         for result in results:
             risk = result.get('risk_level', 'LOW').upper()
@@ -413,40 +724,31 @@ class DashboardGenerator:
             else:
                 stats['low'] += 1
             
-            stats['total_vulns'] += len(result.get('vulns', []))
+            vulns = result.get('vulns', ())
+            stats['total_vulns'] += len(vulns)
+            vuln_count.update(vulns)
+            port_count.update(result.get('ports', ()))
         
-        return stats
+        return stats, vuln_count, port_count
     
-    def _get_vulnerability_data(self, results: List[Dict]) -> Dict:
+    def _get_vulnerability_data(self, vuln_count: Counter) -> Dict:
         """Get top vulnerabilities for chart"""
-        vuln_count = {}
-        
-        for result in results:
-            for vuln in result.get('vulns', []):
-                vuln_count[vuln] = vuln_count.get(vuln, 0) + 1
-        
-        # Get top 10
-        top_vulns = sorted(vuln_count.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Get top 10 (heap selection, no full sort)
+        top_vulns = vuln_count.most_common(10)
         
         return {
-            'labels': [v[0] for v in top_vulns],
-            'data': [v[1] for v in top_vulns]
+            'labels': [v for v, _ in top_vulns],
+            'data': [n for _, n in top_vulns]
         }
     
-    def _get_port_data(self, results: List[Dict]) -> Dict:
+    def _get_port_data(self, port_count: Counter) -> Dict:
         """Get top ports for chart"""
-        port_count = {}
-        
-        for result in results:
-            for port in result.get('ports', []):
-                port_count[port] = port_count.get(port, 0) + 1
-        
-        # Get top 10
-        top_ports = sorted(port_count.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Get top 10 (heap selection, no full sort)
+        top_ports = port_count.most_common(10)
         
         return {
-            'labels': [str(p[0]) for p in top_ports],
-            'data': [p[1] for p in top_ports]
+            'labels': [str(p) for p, _ in top_ports],
+            'data': [n for _, n in top_ports]
         }
     
     def _generate_map(self, results: List[Dict]) -> tuple:
@@ -457,41 +759,23 @@ class DashboardGenerator:
         if not geo_results:
             return ('', '')
         
-        # Generate markers
-        markers = []
-        for result in geo_results:
-            geo = result['geolocation']
-            lat = geo.get('lat')
-            lon = geo.get('lon')
-            # Validate coordinates
-            if lat is not None and lon is not None and -90 <= lat <= 90 and -180 <= lon <= 180:
-                markers.append({
-                    'lat': float(lat),
-                    'lon': float(lon),
-                    'ip': result.get('ip', ''),
-                    'risk': result.get('risk_level', 'UNKNOWN'),
-                    'vulns': len(result.get('vulns', []))
-                })
-        
-        if not markers:
+        # Markers are kept as parallel arrays: coords rows [lat, lon, vulns], meta rows [ip, risk]
+        coords, meta = self._marker_arrays(geo_results)
+        
+        if not meta:
             return ('', '')
         
         # Generate map HTML
-        map_html = f"""
-        <div class="section">
-            <h2 class="section-title">Geographic Distribution</h2>
-            <div id="map" class="map-container"></div>
-        </div>
-        """
+        map_html = (
+            '<div class="section"><h2 class="section-title">Geographic Distribution</h2>'
+            '<div id="map" class="map-container"></div></div>'
+        )
         
         # Generate map script
-        markers_js = json.dumps(markers)
-        # Calculate center from markers
-        avg_lat = sum(m['lat'] for m in markers) / len(markers)
-        avg_lon = sum(m['lon'] for m in markers) / len(markers)
+        markers_js = _dumps({'coords': coords, 'meta': meta})
         map_script = f"""
         // Initialize map
-        const map = L.map('map').setView([{avg_lat}, {avg_lon}], 2);
+        const map = L.map('map');
         
         // Add tile layer
         L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
@@ -499,80 +783,94 @@ class DashboardGenerator:
         }}).addTo(map);
         
         // Add markers
-        const markers = {markers_js};
+        const markerData = {markers_js};
+        const coords = markerData.coords;
+        const meta = markerData.meta;
         const riskColors = {{
-            'CRITICAL': '#f5576c',
-            'HIGH': '#fa709a',
-            'MEDIUM': '#4facfe',
-            'LOW': '#43e97b'
+            'CRITICAL': {{ r: 0.96, g: 0.34, b: 0.42 }},
+            'HIGH': {{ r: 0.98, g: 0.44, b: 0.60 }},
+            'MEDIUM': {{ r: 0.31, g: 0.67, b: 1.00 }},
+            'LOW': {{ r: 0.26, g: 0.91, b: 0.48 }}
         }};
-        
-        markers.forEach(marker => {{
-            const color = riskColors[marker.risk] || '#667eea';
-            const circle = L.circleMarker([marker.lat, marker.lon], {{
-                radius: Math.max(5, Math.min(15, marker.vulns * 2)),
-                fillColor: color,
-                color: '#fff',
-                weight: 2,
-                opacity: 1,
-                fillOpacity: 0.7
-            }}).addTo(map);
-            
-            circle.bindPopup(`
-                <b>IP:</b> ${{marker.ip}}<br>
-                <b>Risk:</b> ${{marker.risk}}<br>
-                <b>Vulnerabilities:</b> ${{marker.vulns}}
-            `);
-        }});
+        const defaultColor = {{ r: 0.40, g: 0.49, b: 0.92 }};
         
         // Fit bounds to show all markers
-        if (markers.length > 1) {{
-            const bounds = markers.map(m => [m.lat, m.lon]);
+        const bounds = coords.map(c => [c[0], c[1]]);
+        if (coords.length > 1) {{
             map.fitBounds(bounds);
+        }} else {{
+            map.setView(bounds[0], 8);
         }}
+        
+        // Draw all markers in a single WebGL layer; the third element is the marker index
+        L.glify.points({{
+            map: map,
+            data: coords.map((c, i) => [c[0], c[1], i]),
+            size: (i, point) => Math.max(10, Math.min(30, coords[point[2]][2] * 4)),
+            color: (i, point) => riskColors[meta[point[2]][1]] || defaultColor,
+            click: (e, point) => {{
+                const i = point[2];
+                L.popup()
+                    .setLatLng(point)
+                    .setContent(`
+                        <b>IP:</b> ${{meta[i][0]}}<br>
+                        <b>Risk:</b> ${{meta[i][1]}}<br>
+                        <b>Vulnerabilities:</b> ${{coords[i][2]}}
+                    `)
+                    .openOn(map);
+            }}
+        }});
         """
         
         return (map_html, map_script)
     
-    def _generate_table_rows(self, results: List[Dict]) -> str:
-        """Generate HTML table rows"""
-        rows = []
-        
-        for result in results:
-            ip = result.get('ip', '')
-            risk = result.get('risk_level', 'UNKNOWN')
-            severity = f"{result.get('severity_score', 0):.1f}"
-            ports = ', '.join(map(str, result.get('ports', [])[:5]))
-            if len(result.get('ports', [])) > 5:
-                ports += f" (+{len(result.get('ports', [])) - 5} more)"
-            vulns = ', '.join(result.get('vulns', [])[:3])
-            if len(result.get('vulns', [])) > 3:
-                vulns += f" (+{len(result.get('vulns', [])) - 3} more)"
-            hostnames = ', '.join(result.get('hostnames', [])[:2])
-            if len(result.get('hostnames', [])) > 2:
-                hostnames += "..."
-            
-            # Get location
-            location = "N/A"
-            if result.get('geolocation'):
-                geo = result['geolocation']
-                if geo.get('city') and geo.get('country'):
-                    location = f"{geo['city']}, {geo['country']}"
-                elif geo.get('country'):
-                    location = geo['country']
-            
-            risk_class = risk.lower()
-            rows.append(f"""
-                <tr>
-                    <td>{ip}</td>
-                    <td><span class="badge {risk_class}">{risk}</span></td>
-                    <td>{severity}</td>
-                    <td>{ports or 'None'}</td>
-                    <td>{vulns or 'None'}</td>
-                    <td>{hostnames or 'None'}</td>
-                    <td>{location}</td>
-                </tr>
-            """)
-        
-        return ''.join(rows)
-
+    def _marker_arrays(self, geo_results: List[Dict]) -> Tuple[Any, List[List[str]]]:
+        """Return marker coords and meta rows for results with in-range coordinates"""
+        if len(geo_results) > NUMPY_MIN_ROWS:
+            try:
+                return self._marker_arrays_numpy(geo_results)
+            except ImportError:
+                pass
+        
+        coords = []
+        meta = []
+        for result in geo_results:
+            geo = result['geolocation']
+            lat = geo.get('lat')
+            lon = geo.get('lon')
+            # Validate coordinates
+            if lat is not None and lon is not None and -90 <= lat <= 90 and -180 <= lon <= 180:
+                coords.append([float(lat), float(lon), len(result.get('vulns') or [])])
+                meta.append(self._marker_meta(result))
+        return coords, meta
+    
+    def _marker_arrays_numpy(self, geo_results: List[Dict]) -> Tuple[Any, List[List[str]]]:
+        """Validate all coordinates with one vectorized mask and keep coords as an ndarray"""
+        # Imported here so scans without a large map never load NumPy
+        import numpy as np
+        count = len(geo_results)
+        lats = np.fromiter(
+            (r['geolocation']['lat'] for r in geo_results), dtype=np.float64, count=count
+        )
+        lons = np.fromiter(
+            (np.nan if (lon := r['geolocation'].get('lon')) is None else lon for r in geo_results),
+            dtype=np.float64, count=count
+        )
+        # NaN compares False, so missing longitudes drop out of the mask
+        mask = (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+        indices = np.flatnonzero(mask)
+        selected = [geo_results[i] for i in indices.tolist()]
+        vulns = np.fromiter(
+            (len(r.get('vulns') or []) for r in selected), dtype=np.float64, count=len(selected)
+        )
+        coords = np.column_stack([lats[indices], lons[indices], vulns])
+        return coords, [self._marker_meta(r) for r in selected]
+    
+    def _marker_meta(self, result: Dict) -> List[str]:
+        """Return the escaped [ip, risk] popup fields for a marker"""
+        return [escape(result.get('ip', '')), escape(result.get('risk_level', 'UNKNOWN'))]
+    
+    def _generate_table_data(self, rows: Iterable['Row']) -> Iterator[str]:
+        """Generate one JSON-encoded DataTables row per result"""
+        for row in rows:
+            yield _dumps(row.to_json())
@@ -0,0 +1,19 @@
+"""
+Wordlist Module - Wordlist loading for fuzzing and brute force
+Reads and decodes the file in one call and splits it once instead of iterating line by line
+"""
+
+from typing import List
+
+
+def load_wordlist(path) -> List[str]:
+    """Return the non-empty, non-comment words in path, stripped and in file order"""
+    with open(path, 'rb') as f:
+        # One decode for the whole file instead of one per line
+        text = f.read().decode('utf-8', 'ignore')
+    words = []
+    for line in text.splitlines():
+        w = line.strip()
+        if w and w[0] != '#':
+            words.append(w)
+    return words
@@ -10,36 +10,42 @@ Combines multiple security tools into one cohesive application:
 """
 
 import argparse
+import ipaddress
 import sys
 import os
+from functools import cache
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
+    # Switch the existing streams in place (no extra writer layer), and only when not already UTF-8
+    if sys.stdout.encoding and sys.stdout.encoding.lower() not in ('utf-8', 'utf8', 'cp65001'):
+        try:
+            sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+            sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+        except (AttributeError, OSError, ValueError):
+            pass
+    # Enable ANSI escape processing (ENABLE_VIRTUAL_TERMINAL_PROCESSING) on legacy consoles
     try:
-        import codecs
-        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
-        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
     except (AttributeError, OSError, ImportError):
         pass
 
-# Import all modules
-from modules.scanner import ScannerModule
-from modules.dns_resolver import DNSResolverModule
-from modules.subdomain_enum import SubdomainEnumModule
-from modules.fuzzer import FuzzerModule
-from modules.csv_extractor import CSVExtractorModule
-from modules.security import SecurityValidator, BlacklistProtection, perform_security_checks
-
-# Color codes
-RED = "\033[91m"
-YELLOW = "\033[93m"
-GREEN = "\033[92m"
-BLUE = "\033[94m"
-CYAN = "\033[96m"
-MAGENTA = "\033[95m"
-RESET = "\033[0m"
-
-BANNER = f"""{GREEN}
+# Color codes (disabled when stdout is not a terminal, NO_COLOR is set or TERM=dumb)
+_COLOR = sys.stdout.isatty() and 'NO_COLOR' not in os.environ and os.environ.get('TERM') != 'dumb'
+RED = "\033[91m" if _COLOR else ""
+YELLOW = "\033[93m" if _COLOR else ""
+GREEN = "\033[92m" if _COLOR else ""
+BLUE = "\033[94m" if _COLOR else ""
+CYAN = "\033[96m" if _COLOR else ""
+MAGENTA = "\033[95m" if _COLOR else ""
+RESET = "\033[0m" if _COLOR else ""
+
+@cache
+def _banner() -> str:
+    """Return the startup banner, built on first use"""
+    return f"""{GREEN}
 
 ██╗   ██╗ █████╗ ██╗      █████╗  ██████╗
 ██║   ██║██╔══██╗██║     ██╔══██╗██╔════╝
@@ -57,10 +63,11 @@ BANNER = f"""{GREEN}
 """
 
 
-def print_help():
-    """Print detailed help information"""
-    print(BANNER)
-    print(f"""
+@cache
+def _help_text() -> str:
+    """Return the full help screen, built on first use"""
+    return _banner() + f"""
+
 {CYAN}Available Modules:{RESET}
 
 {GREEN}1. SCAN{RESET} - IP Vulnerability Scanner
@@ -106,24 +113,46 @@ def print_help():
 
 {CYAN}For detailed help on each module:{RESET}
   python valac.py <module> --help
-""")
 
+"""
 
-def main():
-    """Main entry point for Valac"""
-    parser = argparse.ArgumentParser(
-        description="Valac - Unified Security Scanner Suite",
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    
-    subparsers = parser.add_subparsers(dest='module', help='Module to run')
-    
-    # SCAN module
+
+def print_help():
+    """Print detailed help information"""
+    sys.stdout.write(_help_text())
+    sys.stdout.flush()
+
+
+def _ip(value):
+    """argparse type: parse a single IP address once, at parse time"""
+    try:
+        return ipaddress.ip_address(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid IP address: {value}")
+
+
+def _net(value):
+    """argparse type: parse a CIDR range (host bits allowed)"""
+    try:
+        return ipaddress.ip_network(value, strict=False)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid CIDR range: {value}")
+
+
+def _existing(value):
+    """argparse type: path to an existing file"""
+    if not os.path.isfile(value):
+        raise argparse.ArgumentTypeError(f"no such file: {value}")
+    return value
+
+
+def _add_scan_parser(subparsers):
+    """Add the scan subcommand"""
     scan_parser = subparsers.add_parser('scan', help='IP Vulnerability Scanner')
-    scan_parser.add_argument("-f", "--file", help="File containing IP list")
-    scan_parser.add_argument("--dns-file", help="File containing domain names")
-    scan_parser.add_argument("--ip", help="Single IP to scan")
-    scan_parser.add_argument("--cidr", help="CIDR range to scan")
+    scan_parser.add_argument("-f", "--file", type=_existing, help="File containing IP list")
+    scan_parser.add_argument("--dns-file", type=_existing, help="File containing domain names")
+    scan_parser.add_argument("--ip", type=_ip, help="Single IP to scan")
+    scan_parser.add_argument("--cidr", type=_net, help="CIDR range to scan")
     scan_parser.add_argument("--domain", help="Domain to resolve and scan")
     scan_parser.add_argument("--cves", action="store_true", help="Show CVEs")
     scan_parser.add_argument("--ports", action="store_true", help="Show open ports")
@@ -132,8 +161,10 @@ def main():
     scan_parser.add_argument("--csv", dest="csv_file", help="Output CSV file")
     scan_parser.add_argument("--xml", dest="xml_file", help="Output XML file")
     scan_parser.add_argument("--html", dest="html_file", help="Output HTML report (interactive dashboard)")
+    scan_parser.add_argument("--inline-assets", action="store_true", help="Embed dashboard JS/CSS so the HTML works offline")
     scan_parser.add_argument("--html-simple", dest="html_simple", help="Output simple HTML report (non-interactive)")
     scan_parser.add_argument("-t", "--threads", type=int, default=10, help="Number of threads")
+    scan_parser.add_argument("--async", dest="use_async", action="store_true", help="Scan with asyncio/aiohttp instead of threads (--threads sets concurrency)")
     scan_parser.add_argument("--timeout", type=int, default=5, help="Request timeout")
     scan_parser.add_argument("--delay", type=float, default=0.1, help="Delay between requests")
     scan_parser.add_argument("--rps", type=float, help="Requests per second limit")
@@ -149,18 +180,25 @@ def main():
     scan_parser.add_argument("--bypass-min-delay", type=float, default=1.0, help="Minimum delay between requests")
     scan_parser.add_argument("--bypass-max-delay", type=float, default=3.0, help="Maximum delay between requests")
     scan_parser.add_argument("--proxy-file", help="File with proxy list for bypass")
-    scan_parser.add_argument("--blacklist", help="File with blacklisted IPs/domains")
+    scan_parser.add_argument("--blacklist", type=_existing, help="File with blacklisted IPs/domains")
     scan_parser.add_argument("--skip-security-checks", action="store_true", help="Skip security validation checks")
     scan_parser.add_argument("--check-availability", action="store_true", help="Check target availability before scanning")
-    
-    # RESOLVE module
+    # SUPPRESS keeps a top-level -y from being reset by the subcommand default
+    scan_parser.add_argument("-y", "--yes", action="store_true", default=argparse.SUPPRESS,
+                             help="Assume yes on prompts (or set VALAC_ASSUME_YES=1)")
+
+
+def _add_resolve_parser(subparsers):
+    """Add the resolve subcommand"""
     resolve_parser = subparsers.add_parser('resolve', help='DNS to IP Resolution')
     resolve_parser.add_argument("-i", "--input", default="dns.txt", help="Input file with domains")
     resolve_parser.add_argument("-o", "--output", default="ip.txt", help="Output file for IPs")
     resolve_parser.add_argument("-t", "--workers", type=int, default=10, help="Number of workers")
     resolve_parser.add_argument("--ipv6", action="store_true", help="Include IPv6 addresses")
-    
-    # SUBDOMAIN module
+
+
+def _add_subdomain_parser(subparsers):
+    """Add the subdomain (passive/brute/validate) subcommand"""
     subdomain_parser = subparsers.add_parser('subdomain', help='Subdomain Enumeration')
     subdomain_subparsers = subdomain_parser.add_subparsers(dest='subdomain_mode', required=True)
     
@@ -185,8 +223,10 @@ def main():
     validate_parser.add_argument("-t", "--threads", type=int, default=200, help="Concurrency")
     validate_parser.add_argument("--resolvers", help="File with DNS resolvers")
     validate_parser.add_argument("--http", action="store_true", help="HTTP inventory")
-    
-    # FUZZ module
+
+
+def _add_fuzz_parser(subparsers):
+    """Add the fuzz (dir/vhost) subcommand"""
     fuzz_parser = subparsers.add_parser('fuzz', help='Directory and VHost Fuzzing')
     fuzz_subparsers = fuzz_parser.add_subparsers(dest='fuzz_mode', required=True)
     
@@ -208,96 +248,229 @@ def main():
     vhost_parser.add_argument("-S", nargs="*", type=int, default=[200, 204, 301, 302, 307, 401, 403], help="Status codes")
     vhost_parser.add_argument("--timeout", type=int, default=15, help="Timeout")
     vhost_parser.add_argument("--ua", default="Valac/1.0", help="User-Agent")
-    
-    # EXTRACT module
+
+
+def _add_extract_parser(subparsers):
+    """Add the extract subcommand"""
     extract_parser = subparsers.add_parser('extract', help='Extract domains from CSV')
     extract_parser.add_argument("--input", required=True, help="Input CSV file")
     extract_parser.add_argument("--output", required=True, help="Output file for domains")
     extract_parser.add_argument("--columns", nargs="*", help="Columns to check (names or indices)")
+
+
+def _iter_targets(path):
+    """Yield non-empty, non-comment lines from a targets file"""
+    with open(path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+        for line in f:
+            target = line.strip()
+            if target and target[0] != '#':
+                yield target
+
+
+def _preload_wordlist(path):
+    """Load a wordlist once so every worker shares the same in-memory list"""
+    from modules.wordlist import load_wordlist
+    try:
+        return load_wordlist(path)
+    except OSError:
+        # Let the module report the missing or unreadable file
+        return None
+
+
+_SESSION = None
+
+
+def _get_session(pool_size):
+    """Return the process-wide pooled HTTP session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None:
+        from modules.scanner import build_session
+        _SESSION = build_session(pool_size)
+    return _SESSION
+
+
+# Subcommand parser builders; main() only builds the one being run
+_PARSER_BUILDERS = {
+    'scan': _add_scan_parser,
+    'resolve': _add_resolve_parser,
+    'subdomain': _add_subdomain_parser,
+    'fuzz': _add_fuzz_parser,
+    'extract': _add_extract_parser,
+}
+
+
+def _build_parser(argv):
+    """Build the CLI parser, adding only the requested subcommand when it is known"""
+    parser = argparse.ArgumentParser(
+        description="Valac - Unified Security Scanner Suite",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    
+    parser.add_argument("-y", "--yes", action="store_true", help="Assume yes on prompts (or set VALAC_ASSUME_YES=1)")
+    
+    subparsers = parser.add_subparsers(dest='module', help='Module to run')
     
+    # Help, no arguments or an unknown module still get the full tree
+    builder = _PARSER_BUILDERS.get(argv[0]) if argv else None
+    if builder:
+        builder(subparsers)
+    else:
+        for builder in _PARSER_BUILDERS.values():
+            builder(subparsers)
+    return parser
+
+
+def _run_scan(args):
+    """Run the scan subcommand"""
+    from modules.scanner import ScannerModule
+    from modules.security import BlacklistProtection, perform_security_checks
+
+    # Bail out before any sessions or thread pools are created
+    if not (args.ip or args.cidr or args.domain or args.file or args.dns_file):
+        print(f"{RED}[ERROR]{RESET} No targets given; use --ip, --cidr, --domain, --file or --dns-file")
+        sys.exit(2)
+
+    # Read the target file up front so unreadable or empty input fails before any setup
+    file_targets = []
+    if args.file:
+        try:
+            file_targets = list(_iter_targets(args.file))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"{RED}[ERROR]{RESET} Cannot read {args.file}: {e}")
+            sys.exit(2)
+        if not file_targets and not (args.ip or args.cidr or args.domain or args.dns_file):
+            print(f"{RED}[ERROR]{RESET} No targets found in {args.file}; expected one IP or domain per line")
+            sys.exit(2)
+
+    # Perform security checks if not skipped
+    if not args.skip_security_checks:
+        # Collect targets for validation
+        targets_to_validate = []
+        if args.ip:
+            targets_to_validate.append(str(args.ip))
+        if args.domain:
+            targets_to_validate.append(args.domain)
+        targets_to_validate.extend(file_targets)
+
+        if targets_to_validate:
+            validator = perform_security_checks(
+                targets_to_validate,
+                check_network=True,
+                check_availability=args.check_availability
+            )
+            validator.print_warnings()
+            if validator.errors:
+                validator.print_errors()
+                if args.yes or os.environ.get('VALAC_ASSUME_YES'):
+                    response = 'yes'
+                elif not sys.stdin.isatty():
+                    # Never block on input() in CI/cron/containers
+                    print(f"{RED}[ERROR]{RESET} Security checks reported errors and stdin is not a TTY; use --yes to continue")
+                    sys.exit(2)
+                else:
+                    response = input(f"{YELLOW}Continue despite errors? (yes/no): {RESET}")
+                if response.lower() != 'yes':
+                    print(f"{YELLOW}[INFO]{RESET} Scan cancelled by user")
+                    return
+
+    if args.use_async:
+        from modules.scanner_async import AsyncScannerModule
+        scanner_cls = AsyncScannerModule
+    else:
+        scanner_cls = ScannerModule
+    # Set bypass flag
+    args.use_bypass = args.bypass
+
+    # The async scanner talks aiohttp, so it gets no pooled requests session
+    session = None if args.use_async else _get_session(args.threads)
+    # The bypass cache is saved on exit, including Ctrl+C and errors
+    with scanner_cls(session=session) as scanner:
+        # Apply blacklist if provided
+        if args.blacklist:
+            blacklist_protection = BlacklistProtection(args.blacklist)
+            blacklist_protection.compile()
+            # Filter targets will be done in scanner.run()
+            scanner.blacklist_protection = blacklist_protection
+
+        scanner.run(args)
+
+
+def _run_resolve(args):
+    """Run the resolve subcommand"""
+    from modules.dns_resolver import DNSResolverModule
+    resolver = DNSResolverModule()
+    resolver.run(args)
+
+
+def _run_subdomain(args):
+    """Run the subdomain subcommand"""
+    from modules.subdomain_enum import SubdomainEnumModule
+    if args.subdomain_mode == 'brute':
+        args.wordlist_data = _preload_wordlist(args.wordlist)
+    subenum = SubdomainEnumModule()
+    subenum.run(args)
+
+
+def _run_fuzz(args):
+    """Run the fuzz subcommand"""
+    from modules.fuzzer import FuzzerModule
+    args.wordlist_data = _preload_wordlist(args.w)
+    fuzzer = FuzzerModule()
+    fuzzer.run(args)
+
+
+def _run_extract(args):
+    """Run the extract subcommand"""
+    from modules.csv_extractor import CSVExtractorModule
+    extractor = CSVExtractorModule()
+    extractor.run(args)
+
+
+# Subcommand runners; each imports only the modules it needs
+_RUNNERS = {
+    'scan': _run_scan,
+    'resolve': _run_resolve,
+    'subdomain': _run_subdomain,
+    'fuzz': _run_fuzz,
+    'extract': _run_extract,
+}
+
+
+def main():
+    """Main entry point for Valac"""
+    parser = _build_parser(sys.argv[1:])
     args = parser.parse_args()
     
     if not args.module:
         print_help()
         return
     
-    # Clear screen and show banner
-    os.system("clear" if os.name == "posix" else "cls")
-    print(BANNER)
+    # Clear screen and scrollback with ANSI escapes instead of spawning clear/cls
+    if sys.stdout.isatty():
+        sys.stdout.write("\033[2J\033[3J\033[H")
+        sys.stdout.flush()
+    print(_banner())
     
     try:
-        # Route to appropriate module
-        if args.module == 'scan':
-            # Perform security checks if not skipped
-            if not getattr(args, 'skip_security_checks', False):
-                # Collect targets for validation
-                targets_to_validate = []
-                if args.ip:
-                    targets_to_validate.append(args.ip)
-                if args.domain:
-                    targets_to_validate.append(args.domain)
-                if args.file:
-                    try:
-                        with open(args.file, 'r', encoding='utf-8') as f:
-                            targets_to_validate.extend([line.strip() for line in f if line.strip() and not line.startswith('#')])
-                    except (FileNotFoundError, IOError, PermissionError, UnicodeDecodeError):
-                        pass
-                
-                if targets_to_validate:
-                    validator = perform_security_checks(
-                        targets_to_validate,
-                        check_network=True,
-                        check_availability=getattr(args, 'check_availability', False)
-                    )
-                    validator.print_warnings()
-                    if validator.errors:
-                        validator.print_errors()
-                        response = input(f"{YELLOW}Continue despite errors? (yes/no): {RESET}")
-                        if response.lower() != 'yes':
-                            print(f"{YELLOW}[INFO]{RESET} Scan cancelled by user")
-                            return
-            
-            scanner = ScannerModule()
-            # Set bypass flag
-            args.use_bypass = getattr(args, 'bypass', False)
-            
-            # Apply blacklist if provided
-            if hasattr(args, 'blacklist') and args.blacklist:
-                blacklist_protection = BlacklistProtection(args.blacklist)
-                # Filter targets will be done in scanner.run()
-                scanner.blacklist_protection = blacklist_protection
-            
-            scanner.run(args)
-            # Save bypass cache if used
-            if scanner.use_bypass and scanner.bypass_system:
-                scanner.bypass_system.save_cache()
-                bypass_stats = scanner.bypass_system.get_stats()
-                if bypass_stats['cached'] > 0:
-                    print(f"{CYAN}[INFO]{RESET} Bypass stats: {bypass_stats['success']} success, {bypass_stats['cached']} cached, {bypass_stats['rate_limited']} rate limited")
-        elif args.module == 'resolve':
-            resolver = DNSResolverModule()
-            resolver.run(args)
-        elif args.module == 'subdomain':
-            subenum = SubdomainEnumModule()
-            subenum.run(args)
-        elif args.module == 'fuzz':
-            fuzzer = FuzzerModule()
-            fuzzer.run(args)
-        elif args.module == 'extract':
-            extractor = CSVExtractorModule()
-            extractor.run(args)
-        else:
+        runner = _RUNNERS.get(args.module)
+        if runner is None:
             print(f"{RED}[ERROR]{RESET} Unknown module: {args.module}")
             print_help()
             sys.exit(1)
-            
+        runner(args)
     except KeyboardInterrupt:
         print(f"\n{YELLOW}[WARN]{RESET} Operation interrupted by user")
         sys.exit(0)
     except Exception as e:
-        print(f"\n{RED}[ERROR]{RESET} Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get('VALAC_DEBUG'):
+            import traceback
+            sys.stderr.write(f"\n{RED}[ERROR]{RESET} Fatal error: {e}\n{traceback.format_exc()}")
+        else:
+            # Report only the innermost frame; no source lookup or frame formatting
+            tb = e.__traceback__
+            while tb.tb_next:
+                tb = tb.tb_next
+            sys.stderr.write(f"\n{RED}[ERROR]{RESET} {type(e).__name__}: {e} at {tb.tb_frame.f_code.co_filename}:{tb.tb_lineno} (set VALAC_DEBUG=1 for the full traceback)\n")
         sys.exit(1)
 
 